@@ -0,0 +1,28 @@
+"""
+JSON parser backed by orjson
+"""
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ORJSONParser(JSONParser):
+    """
+    Parses JSON request bodies with orjson, falling back to DRF's JSONParser
+    when orjson isn't installed. Meant for the chat views; it isn't the
+    project-wide default parser
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
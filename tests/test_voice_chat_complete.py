@@ -20,6 +20,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Voice chat core functionality checks (WebSocket binding is not required)
+CORE_TESTS = frozenset({'adk_handler', 'audio_processing', 'live_streaming', 'travel_agent'})
+
 def print_status(message: str, status: str = "INFO"):
     """Print colored status messages"""
     colors = {
@@ -314,13 +317,17 @@ async def test_live_session_streaming():
         logger.exception("Live session streaming test failed")
         return False
     finally:
-        # Ensure cleanup
+        # Ensure cleanup (session_id is only set once the handler import succeeded)
         if session_id:
             try:
-                from travel_concierge.voice_chat.adk_live_handler import adk_live_handler
-                await adk_live_handler.close_session(session_id)
-            except:
-                pass
+                await asyncio.wait_for(
+                    asyncio.shield(adk_live_handler.close_session(session_id)),
+                    timeout=3
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"Timed out closing streaming session {session_id}")
+            except Exception as e:
+                logger.warning(f"Error closing streaming session {session_id}: {e}")
 
 async def test_travel_agent_integration():
     """Test travel agent integration with voice chat"""
@@ -377,11 +384,14 @@ async def cleanup_all_sessions():
 
         if active_sessions:
             print_status(f"Cleaning up {len(active_sessions)} remaining sessions...", "INFO")
-            for session_id in active_sessions:
-                try:
-                    await adk_live_handler.close_session(session_id)
-                except Exception as e:
-                    logger.debug(f"Error cleaning up session {session_id}: {e}")
+            # Close all sessions concurrently; one failure doesn't mask the others
+            results = await asyncio.gather(
+                *[adk_live_handler.close_session(s) for s in active_sessions],
+                return_exceptions=True
+            )
+            for session_id, result in zip(active_sessions, results):
+                if isinstance(result, Exception):
+                    logger.debug(f"Error cleaning up session {session_id}: {result}")
 
             print_status("Session cleanup completed", "SUCCESS")
 
@@ -434,21 +444,23 @@ async def run_comprehensive_test():
 
     # Summary
     print_status("\n=== TEST SUMMARY ===", "INFO")
-    passed_tests = sum(1 for result in test_results.values() if result)
     total_tests = len(test_results)
 
+    # Single pass: count overall and core passes while printing each result
+    passed_tests = 0
+    core_passed = 0
     for test_name, result in test_results.items():
-        status = "SUCCESS" if result else "ERROR"
-        print_status(f"{test_name}: {'PASSED' if result else 'FAILED'}", status)
+        ok = bool(result)
+        passed_tests += ok
+        core_passed += ok and test_name in CORE_TESTS
+        status = "SUCCESS" if ok else "ERROR"
+        print_status(f"{test_name}: {'PASSED' if ok else 'FAILED'}", status)
 
     print_status(f"\nOverall: {passed_tests}/{total_tests} tests passed",
                 "SUCCESS" if passed_tests == total_tests else "WARNING")
 
     # Special handling for voice chat core functionality
-    core_tests = ['adk_handler', 'audio_processing', 'live_streaming', 'travel_agent']
-    core_passed = sum(1 for test in core_tests if test_results.get(test, False))
-
-    if core_passed == len(core_tests):
+    if core_passed == len(CORE_TESTS):
         print_status("🎉 Voice Chat CORE functionality is working!", "SUCCESS")
         print_status("The WebSocket server issue is just a binding problem in Docker.", "INFO")
         print_status("Voice chat will work when deployed properly.", "SUCCESS")
@@ -484,11 +496,10 @@ def main():
         result = asyncio.run(run_comprehensive_test())
 
         # Exit with appropriate code
-        core_tests = ['adk_handler', 'audio_processing', 'live_streaming', 'travel_agent']
-        core_passed = sum(1 for test in core_tests if result.get(test, False))
+        core_passed = sum(1 for test in CORE_TESTS if result.get(test, False))
 
         # If core functionality works, consider success even with WebSocket binding issue
-        if core_passed == len(core_tests):
+        if core_passed == len(CORE_TESTS):
             sys.exit(0)
         else:
             sys.exit(1)
@@ -14,11 +14,9 @@
 
 """Demonstration of Travel AI Conceirge using Agent Development Kit"""
 
-from google.adk.agents import Agent
 import os
+import threading
 import time
-import google.generativeai as genai
-from google.api_core import retry
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -26,48 +24,75 @@ load_dotenv()
 
 from travel_concierge import prompt
 
-from travel_concierge.sub_agents.booking.agent import booking_agent
-from travel_concierge.sub_agents.in_trip.agent import in_trip_agent
-from travel_concierge.sub_agents.inspiration.agent import inspiration_agent
-from travel_concierge.sub_agents.planning.agent import planning_agent
-from travel_concierge.sub_agents.post_trip.agent import post_trip_agent
-from travel_concierge.sub_agents.pre_trip.agent import pre_trip_agent
-
-from travel_concierge.tools.memory import _load_precreated_itinerary
-
 # Disable OpenTelemetry to fix context detach errors
-os.environ.setdefault('OTEL_SDK_DISABLED', 'true')
-os.environ.setdefault('OTEL_TRACES_EXPORTER', 'none')
-os.environ.setdefault('OTEL_METRICS_EXPORTER', 'none')
-os.environ.setdefault('OTEL_LOGS_EXPORTER', 'none')
+_OTEL_DEFAULTS = {
+    'OTEL_SDK_DISABLED': 'true',
+    'OTEL_TRACES_EXPORTER': 'none',
+    'OTEL_METRICS_EXPORTER': 'none',
+    'OTEL_LOGS_EXPORTER': 'none',
+}
+os.environ.update({k: v for k, v in _OTEL_DEFAULTS.items() if k not in os.environ})
+
+# Set once configure_genai() has run, so warm starts skip the handshake
+_GENAI_CONFIGURED = False
 
 # Configure Gemini API with retry logic
 def configure_genai():
+    global _GENAI_CONFIGURED
+    if _GENAI_CONFIGURED:
+        return
     api_key = os.getenv('GOOGLE_CLOUD_API_KEY')
     if not api_key:
         raise ValueError("GOOGLE_CLOUD_API_KEY environment variable is not set")
     import google.generativeai as genai
     genai.configure(api_key=api_key)
-    # List available models to verify access
-    # print("Checking available Gemini models...")
-    for m in genai.list_models():
-        print(f"Found model: {m.name}")
+    _GENAI_CONFIGURED = True
+    # Listing models is a network round-trip, only do it when debugging access
+    if os.getenv('TRAVEL_CONCIERGE_DEBUG_MODELS'):
+        for m in genai.list_models():
+            print(f"Found model: {m.name}")
 
 # XÓA dòng này để không override context xác thực cho toàn bộ process
 # configure_genai()
 
-root_agent = Agent(
-    model="gemini-2.0-flash-exp",
-    name="root_agent",
-    description="A Travel Conceirge using the services of multiple sub-agents",
-    instruction=prompt.ROOT_AGENT_INSTR,
-    sub_agents=[
-        inspiration_agent,
-        planning_agent,
-        booking_agent,
-        pre_trip_agent,
-        in_trip_agent,
-        post_trip_agent,
-    ],
-    before_agent_callback=_load_precreated_itinerary,
-)
+_root_agent_lock = threading.Lock()
+
+
+def _build_root_agent():
+    """Import the ADK and sub-agents and build the root agent"""
+    from google.adk.agents import Agent
+
+    from travel_concierge.sub_agents.booking.agent import booking_agent
+    from travel_concierge.sub_agents.in_trip.agent import in_trip_agent
+    from travel_concierge.sub_agents.inspiration.agent import inspiration_agent
+    from travel_concierge.sub_agents.planning.agent import planning_agent
+    from travel_concierge.sub_agents.post_trip.agent import post_trip_agent
+    from travel_concierge.sub_agents.pre_trip.agent import pre_trip_agent
+
+    from travel_concierge.tools.memory import _load_precreated_itinerary
+
+    return Agent(
+        model="gemini-2.0-flash-exp",
+        name="root_agent",
+        description="A Travel Conceirge using the services of multiple sub-agents",
+        instruction=prompt.ROOT_AGENT_INSTR,
+        sub_agents=[
+            inspiration_agent,
+            planning_agent,
+            booking_agent,
+            pre_trip_agent,
+            in_trip_agent,
+            post_trip_agent,
+        ],
+        before_agent_callback=_load_precreated_itinerary,
+    )
+
+
+def __getattr__(name):
+    """Build ``root_agent`` on first access (PEP 562) so importing this module stays cheap"""
+    if name == "root_agent":
+        with _root_agent_lock:
+            if "root_agent" not in globals():
+                globals()["root_agent"] = _build_root_agent()
+        return globals()["root_agent"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,27 @@
+import logging
+import os
+
+from django.apps import AppConfig
+
+
+class TravelConciergeConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'travel_concierge'
+    verbose_name = 'Travel Concierge'
+
+    def ready(self):
+        """Optionally warm the shared services when Django starts"""
+        # Off by default so management commands (migrate, shell, ...) don't
+        # pay for loading the ADK; set it for web server processes
+        if os.getenv('TRAVEL_CONCIERGE_PRELOAD_AGENT', '').lower() not in ('1', 'true', 'yes'):
+            return
+
+        from .service.agent_service import get_agent_service
+        from .service.travel_service import get_travel_service
+
+        try:
+            agent_service = get_agent_service()
+            agent_service.runner  # Builds the root agent and its Runner
+            get_travel_service()
+        except Exception as e:
+            logging.getLogger(__name__).error("Failed to preload travel concierge services: %s", e)
@@ -11,6 +11,8 @@ from django.conf import settings
 
 from travel_concierge.voice_chat.websocket_server import voice_websocket_server
 
+logger = logging.getLogger(__name__)
+
 
 class Command(BaseCommand):
     help = 'Start the Voice Chat WebSocket server for real-time audio streaming'
@@ -43,7 +45,6 @@ class Command(BaseCommand):
             level=log_level,
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
-        logger = logging.getLogger(__name__)
 
         # Update server configuration
         voice_websocket_server.host = options['host']
@@ -54,14 +55,6 @@ class Command(BaseCommand):
         logger.info(f"🔌 Port: {options['port']}")
         logger.info(f"📊 Log Level: {options['log_level']}")
 
-        # Setup signal handlers for graceful shutdown
-        def signal_handler(signum, frame):
-            logger.info(f"🛑 Received signal {signum}, shutting down...")
-            asyncio.create_task(self.shutdown_server())
-
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
-
         # Start the server
         try:
             asyncio.run(self.run_server())
@@ -73,7 +66,19 @@ class Command(BaseCommand):
 
     async def run_server(self):
         """Run the WebSocket server"""
-        logger = logging.getLogger(__name__)
+        # Setup signal handlers for graceful shutdown, run on the server's loop
+        loop = asyncio.get_running_loop()
+
+        def signal_handler(signum, frame=None):
+            logger.info(f"🛑 Received signal {signum}, shutting down...")
+            loop.call_soon_threadsafe(lambda: loop.create_task(self.shutdown_server()))
+
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, signal_handler, signum)
+            except NotImplementedError:
+                # Windows event loops don't support add_signal_handler
+                signal.signal(signum, signal_handler)
 
         try:
             # Start the WebSocket server
@@ -84,9 +89,10 @@ class Command(BaseCommand):
             logger.info("📱 Flutter apps can now connect for voice chat")
             logger.info("⚡ Press Ctrl+C to stop the server")
 
-            # Keep the server running
-            while voice_websocket_server.is_running:
-                await asyncio.sleep(1)
+            # Keep the server running until stop_server() is called
+            await voice_websocket_server.wait_stopped()
+            if voice_websocket_server.is_running:
+                await self.shutdown_server()
 
         except Exception as e:
             logger.error(f"❌ Failed to start server: {str(e)}")
@@ -94,8 +100,6 @@ class Command(BaseCommand):
 
     async def shutdown_server(self):
         """Gracefully shutdown the server"""
-        logger = logging.getLogger(__name__)
-
         try:
             logger.info("🔄 Shutting down Voice Chat WebSocket Server...")
             await voice_websocket_server.stop_server()
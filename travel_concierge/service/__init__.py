@@ -1,9 +1,26 @@
 # Travel Concierge Service Package
-
-from .agent_service import AgentService
-from .travel_service import TravelService
+# Services are loaded on first attribute access (PEP 562), so importing
+# TravelService doesn't pull in AgentService and its dependencies
 
 __all__ = [
     'AgentService',
     'TravelService',
-]
\ No newline at end of file
+    'get_agent_service',
+    'get_travel_service',
+]
+
+
+def __getattr__(name):
+    if name in ('AgentService', 'get_agent_service'):
+        from . import agent_service
+        value = globals()[name] = getattr(agent_service, name)
+        return value
+    if name in ('TravelService', 'get_travel_service'):
+        from . import travel_service
+        value = globals()[name] = getattr(travel_service, name)
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(__all__)
\ No newline at end of file
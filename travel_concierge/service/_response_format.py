@@ -0,0 +1,37 @@
+"""
+Response formatting for mobile app parsing
+Pure str -> str helpers with no Django or ADK dependencies, kept apart from
+AgentService so they can be compiled (e.g. with mypyc) as a standalone module
+"""
+
+import re
+from typing import Tuple
+
+# "Day N" in other languages (Vietnamese, French, Spanish, German), rewritten to "Day N"
+DAY_RE = re.compile(r'(?:Ngày|Jour|Día|Tag)\s*(\d+)', re.IGNORECASE)
+
+# A "Day N" keyword at the very end of a streamed chunk, still waiting for its number
+DAY_TAIL_RE = re.compile(r'(?:Ngày|Jour|Día|Tag)\s*\Z', re.IGNORECASE)
+
+# Casefolded keywords checked before running DAY_RE: most (English) replies
+# contain none of them, and ``in`` is much cheaper than a regex scan. The reply
+# is casefolded too, so this matches every casing DAY_RE's IGNORECASE does
+DAY_KEYWORDS: Tuple[str, ...] = ('ngày', 'jour', 'día', 'tag')
+
+
+def enhance(response: str) -> str:
+    """
+    Enhance response structure to ensure consistent format for mobile app parsing
+
+    Anything that isn't a non-empty string (e.g. None) is returned unchanged
+    """
+    if not isinstance(response, str) or not response:
+        return response
+
+    # Ensure Day format is consistent: replace "Ngày X" and other
+    # language variations with "Day X" for mobile app compatibility
+    folded = response.casefold()
+    for keyword in DAY_KEYWORDS:
+        if keyword in folded:
+            return DAY_RE.sub(r'Day \1', response)
+    return response
@@ -3,13 +3,178 @@ Service layer for AI Agent functionality
 This service wraps the root_agent and provides business logic for AI interactions
 """
 
+import asyncio
+import io
 import logging
+import re
+import sys
+import threading
 import time
-from typing import Dict, Any, Optional, List
+import uuid
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Hashable, Optional, List, Tuple, AsyncIterator, Iterator
 from django.core.exceptions import ValidationError
 
-# Import the root agent - keep this import path to maintain compatibility
-from travel_concierge.agent import root_agent
+from ._response_format import DAY_TAIL_RE, enhance as _enhance_response
+
+# Suppress OpenTelemetry context warnings specifically (installed once per process)
+warnings.filterwarnings("ignore", category=UserWarning, module="opentelemetry")
+
+# Matches OpenTelemetry context errors (e.g. "... different Context ...")
+_CTX_ERR_RE = re.compile(r'context', re.IGNORECASE)
+
+# Upper bound (seconds) on one agent turn run on the background loop
+AGENT_RESPONSE_TIMEOUT = 120
+
+# Long-lived event loop shared by all AgentService instances; runs in a daemon thread
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+_event_loop_lock = threading.Lock()
+
+
+def _run_event_loop(loop: asyncio.AbstractEventLoop) -> None:
+    asyncio.set_event_loop(loop)
+    loop.run_forever()
+
+
+# Bounds for the per-user ADK session cache: entry count and idle TTL (seconds)
+SESSION_CACHE_MAXSIZE = 10_000
+SESSION_IDLE_TTL = 15 * 60
+
+# Background chat tasks: worker threads (concurrent agent turns), and how
+# many finished/pending tasks are kept and for how long (seconds) after last poll
+CHAT_TASK_WORKERS = 8
+CHAT_TASK_MAXSIZE = 10_000
+CHAT_TASK_RESULT_TTL = 15 * 60
+
+# Sentinel returned by _next_chunk once a stream is exhausted
+_STREAM_END = object()
+
+
+async def _next_chunk(stream: AsyncIterator[str]):
+    """Await the next chunk of an async stream, or _STREAM_END when it's done"""
+    try:
+        return await stream.__anext__()
+    except StopAsyncIteration:
+        return _STREAM_END
+
+
+async def _close_stream(stream, pending: Optional[asyncio.Task]):
+    """
+    Close an async stream once ``pending``, the task of its last __anext__
+    call, has settled; closing a generator still running (e.g. its cancelled
+    __anext__ unwinding after a timeout) raises RuntimeError
+    """
+    if pending is not None:
+        await asyncio.gather(pending, return_exceptions=True)
+    await stream.aclose()
+
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """New loop for the background thread: uvloop where available, else asyncio's default"""
+    if sys.platform != 'win32':
+        try:
+            import uvloop
+            return uvloop.new_event_loop()
+        except ImportError:
+            pass
+    return asyncio.new_event_loop()
+
+
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared background event loop, starting its thread on first use"""
+    global _event_loop
+    with _event_loop_lock:
+        if _event_loop is None:
+            loop = _new_event_loop()
+            threading.Thread(
+                target=_run_event_loop, args=(loop,), name='agent-service-loop', daemon=True
+            ).start()
+            _event_loop = loop
+    return _event_loop
+
+
+def _run_on_event_loop(coro, timeout: float = AGENT_RESPONSE_TIMEOUT):
+    """Run coro on the shared background loop and block for its result"""
+    loop = _get_event_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        # Blocking here would stall the loop that has to produce the result
+        coro.close()
+        raise RuntimeError("Synchronous agent call made from the agent event loop; await the async API instead")
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result(timeout=timeout)
+    except BaseException:
+        future.cancel()
+        raise
+
+
+class _SessionCache:
+    """
+    Bounded LRU (ADK sessions, chat task futures) with an idle TTL
+    Expired entries are purged on access; evicted values go to on_evict
+    """
+
+    def __init__(self, maxsize: int, ttl: float, on_evict):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._on_evict = on_evict
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _purge_expired(self, now: float) -> List[Any]:
+        # Entries are kept in last-access order, so expired ones sit at the front
+        evicted = []
+        while self._entries:
+            key, (session, last_access) = next(iter(self._entries.items()))
+            if now - last_access < self.ttl:
+                break
+            del self._entries[key]
+            evicted.append(session)
+        return evicted
+
+    def get(self, key: Hashable):
+        """Return the cached session for key (refreshing its TTL), or None"""
+        with self._lock:
+            now = time.monotonic()
+            evicted = self._purge_expired(now)
+            entry = self._entries.get(key)
+            session = None
+            if entry is not None:
+                session = entry[0]
+                self._entries[key] = (session, now)
+                self._entries.move_to_end(key)
+        for old in evicted:
+            self._on_evict(old)
+        return session
+
+    def set(self, key: Hashable, session) -> None:
+        """Cache session for key, evicting expired and least recently used entries"""
+        with self._lock:
+            now = time.monotonic()
+            evicted = self._purge_expired(now)
+            self._entries[key] = (session, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                evicted.append(self._entries.popitem(last=False)[1][0])
+        for old in evicted:
+            self._on_evict(old)
+
+
+# Worker pool and result store behind submit_chat_message/get_chat_result;
+# the pool's threads start on first submit
+_chat_executor = ThreadPoolExecutor(max_workers=CHAT_TASK_WORKERS, thread_name_prefix='agent-chat')
+_chat_tasks = _SessionCache(CHAT_TASK_MAXSIZE, CHAT_TASK_RESULT_TTL, lambda future: future.cancel())
 
 
 class AgentService:
@@ -17,23 +182,99 @@ class AgentService:
 
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        # Initialize services once for reuse
-        import asyncio
-        from google.adk.runners import Runner
+        # Initialize services once for reuse. The ADK/GenAI imports stay here,
+        # off the module import path, so importing this module doesn't load the SDK
         from google.adk.sessions import InMemorySessionService
         from google.adk.artifacts.in_memory_artifact_service import InMemoryArtifactService
         from google.genai import types
 
+        self._types = types  # google.genai.types, used on every message
         self.session_service = InMemorySessionService()
         self.artifacts_service = InMemoryArtifactService()
-        self.sessions = {}  # Cache for user sessions
-        self.root_agent = None
-        try:
-            self.root_agent = root_agent
-            self.logger.info("AI Agent initialized successfully")
-        except Exception as e:
-            self.logger.error(f"Failed to initialize AI Agent: {e}")
-            raise
+        # Cache for user sessions, keyed by (user_id, session_id)
+        self.sessions = _SessionCache(SESSION_CACHE_MAXSIZE, SESSION_IDLE_TTL, self._discard_session)
+        # asyncio.Lock per (user_id, session_id) being created, so concurrent
+        # first messages from one user share a single ADK session
+        self._session_locks: Dict[Tuple[str, Optional[str]], asyncio.Lock] = {}
+        self._runner = None
+        self._root_agent = None
+
+    @property
+    def root_agent(self):
+        """Root agent, resolved on first access so importing this module stays cheap"""
+        if self._root_agent is None:
+            try:
+                # Keep this import path to maintain compatibility
+                from travel_concierge import agent
+                self._root_agent = agent.root_agent
+                self.logger.info("AI Agent initialized successfully")
+            except Exception as e:
+                self.logger.error("Failed to initialize AI Agent: %s", e)
+                raise
+        return self._root_agent
+
+    # Root agent metadata and sub-agents are fixed at construction, so they're
+    # probed once per service instance
+
+    @cached_property
+    def sub_agents(self) -> Tuple[Any, ...]:
+        """Sub-agents of the root agent"""
+        return tuple(getattr(self.root_agent, 'sub_agents', None) or ())
+
+    @cached_property
+    def sub_agent_count(self) -> int:
+        return len(self.sub_agents)
+
+    @cached_property
+    def sub_agent_names(self) -> Tuple[str, ...]:
+        return tuple(getattr(sub_agent, 'name', 'unknown') for sub_agent in self.sub_agents)
+
+    @cached_property
+    def agent_name(self) -> str:
+        return getattr(self.root_agent, 'name', 'root_agent')
+
+    @cached_property
+    def agent_description(self) -> str:
+        return getattr(self.root_agent, 'description', 'Travel Concierge Agent')
+
+    @cached_property
+    def _status_info(self) -> MappingProxyType:
+        """Read-only status of the root agent, copied out by get_agent_status"""
+        return MappingProxyType({
+            'agent_name': self.agent_name,
+            'description': self.agent_description,
+            'sub_agents_count': self.sub_agent_count,
+            'status': 'active'
+        })
+
+    @cached_property
+    def _sub_agent_summaries(self) -> Tuple[MappingProxyType, ...]:
+        """Read-only name and description of each sub-agent"""
+        return tuple(
+            MappingProxyType({
+                'name': getattr(sub_agent, 'name', 'unknown'),
+                'description': getattr(sub_agent, 'description', 'No description'),
+            })
+            for sub_agent in self.sub_agents
+        )
+
+    @cached_property
+    def _configuration_validation(self) -> Dict[str, Any]:
+        """Result of _build_configuration_validation, copied out by validate_agent_configuration"""
+        return self._build_configuration_validation()
+
+    @property
+    def runner(self):
+        """Runner for the root agent, built once and reused for every message"""
+        if self._runner is None:
+            from google.adk.runners import Runner
+            self._runner = Runner(
+                app_name="travel-concierge",
+                agent=self.root_agent,
+                artifact_service=self.artifacts_service,
+                session_service=self.session_service,
+            )
+        return self._runner
 
     def process_chat_message(self, message: str, user_id: str, session_id: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -48,13 +289,13 @@ class AgentService:
             Dict containing agent response and metadata
         """
         try:
-            self.logger.info(f"Processing chat message for user {user_id}: {message[:100]}...")
+            self.logger.info("Processing chat message for user %s: %.100s...", user_id, message)
 
             # Process message through root agent
             # This maintains the existing agent functionality
             response = self._interact_with_agent(message, user_id, session_id)
 
-            self.logger.info(f"Agent response generated for user {user_id}")
+            self.logger.info("Agent response generated for user %s", user_id)
 
             # Ensure proper UTF-8 encoding for response
             if isinstance(response, bytes):
@@ -73,8 +314,41 @@ class AgentService:
             }
 
         except Exception as e:
-            self.logger.error(f"Error processing chat message: {e}")
-            raise ValidationError(f"Unable to process chat message: {str(e)}")
+            msg = str(e)
+            self.logger.error("Error processing chat message: %s", msg)
+            raise ValidationError(f"Unable to process chat message: {msg}")
+
+    def submit_chat_message(self, message: str, user_id: str, session_id: Optional[str] = None) -> str:
+        """
+        Queue a chat message for processing on the background worker pool
+
+        Returns:
+            Task id to pass to get_chat_result
+        """
+        task_id = uuid.uuid4().hex
+        future = _chat_executor.submit(self.process_chat_message, message, user_id, session_id)
+        _chat_tasks.set(task_id, future)
+        self.logger.info("Queued chat task %s for user %s", task_id, user_id)
+        return task_id
+
+    def get_chat_result(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the state of a chat task queued by submit_chat_message
+
+        Returns:
+            Dict with the task status ('pending', 'completed' or 'error') and,
+            once finished, its result or error; None for an unknown or expired task
+        """
+        future = _chat_tasks.get(task_id)
+        if future is None:
+            return None
+        if not future.done():
+            return {'task_id': task_id, 'status': 'pending'}
+        try:
+            result = future.result()
+        except Exception as e:
+            return {'task_id': task_id, 'status': 'error', 'error': str(e)}
+        return {'task_id': task_id, 'status': 'completed', 'result': result}
 
     def _interact_with_agent(self, message: str, user_id: str, session_id: Optional[str] = None) -> str:
         """
@@ -82,96 +356,10 @@ class AgentService:
         This method can be extended to handle different interaction patterns
         """
         try:
-            # Suppress OpenTelemetry context warnings specifically
-            import warnings
-            warnings.filterwarnings("ignore", category=UserWarning, module="opentelemetry")
-
-            # Import required modules for AI agent interaction
-            import asyncio
-            from google.adk.runners import Runner
-            from google.adk.sessions import InMemorySessionService
-            from google.adk.artifacts.in_memory_artifact_service import InMemoryArtifactService
-            from google.genai import types
-            import time
-
-            # Get or create session for this user
-            if not session_id:
-                session_id = f"session_{user_id}_{int(time.time())}"
-
-            # Check if session already exists for this user
-            if user_id in self.sessions:
-                session = self.sessions[user_id]
-                self.logger.info(f"Reusing existing session for user {user_id}")
-            else:
-                # Create new session for this user
-                session = self.session_service.create_session_sync(
-                    state={},
-                    app_name="travel-concierge",
-                    user_id=user_id
-                )
-                self.sessions[user_id] = session
-                self.logger.info(f"Created new session for user {user_id}")
-
-            # Create content for the message
-            content = types.Content(role="user", parts=[types.Part(text=message)])
-
-            # Create runner with root agent
-            runner = Runner(
-                app_name="travel-concierge",
-                agent=self.root_agent,
-                artifact_service=self.artifacts_service,
-                session_service=self.session_service,
-            )
-
-            # Run the agent asynchronously
-            async def run_agent_async():
-                # Run the agent
-                events_async = runner.run_async(
-                    session_id=session.id,
-                    user_id=user_id,
-                    new_message=content
-                )
-
-                # Collect response
-                response_parts = []
-                async for event in events_async:
-                    if event.content and event.content.parts:
-                        for part in event.content.parts:
-                            if part.text:
-                                # Clean up the text response
-                                text = part.text.strip()
-                                if text and text != "{}":
-                                    response_parts.append(text)
-                            # Handle function responses that might contain map_url and image_url
-                            if part.function_response:
-                                func_response = str(part.function_response.response)
-                                if func_response and func_response != "{}":
-                                    response_parts.append(func_response)
-                            # Handle function calls
-                            if part.function_call:
-                                # Extract function call name and arguments
-                                func_name = part.function_call.name if hasattr(part.function_call, 'name') else 'unknown'
-                                func_args = part.function_call.args if hasattr(part.function_call, 'args') else {}
-                                if func_name and func_args:
-                                    response_parts.append(f"Calling {func_name} with arguments: {func_args}")
-
-                return "\n".join(response_parts)
-
-            # Run the async function
-            try:
-                response = asyncio.run(run_agent_async())
-            except RuntimeError as e:
-                # Handle case where event loop is already running
-                if "event loop is running" in str(e):
-                    # Create new event loop
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        response = loop.run_until_complete(run_agent_async())
-                    finally:
-                        loop.close()
-                else:
-                    raise e
+            # Run the agent on the persistent background loop. Turns from
+            # concurrent requests are scheduled as separate tasks there, so
+            # their run_async calls already overlap without extra batching
+            response = _run_on_event_loop(self._interact_with_agent_async(message, user_id, session_id))
 
             if not response:
                 response = f"Agent response to: {message}"
@@ -183,107 +371,210 @@ class AgentService:
                 response = str(response)
 
             # Log response for debugging
-            self.logger.info(f"Raw agent response: {response[:200]}...")
+            self.logger.info("Raw agent response: %.200s...", response)
 
             return response
 
         except (ValueError, RuntimeError) as e:
             # Handle specific OpenTelemetry context errors
-            if "different Context" in str(e) or "context" in str(e).lower():
-                self.logger.warning(f"OpenTelemetry context issue ignored: {e}")
+            msg = str(e)
+            if _CTX_ERR_RE.search(msg):
+                self.logger.warning("OpenTelemetry context issue ignored: %s", msg)
                 return f"Agent response to: {message} (context issue handled)"
             raise
         except Exception as e:
-            self.logger.error(f"Error in agent interaction: {e}")
+            msg = str(e)
+            self.logger.error("Error in agent interaction: %s", msg)
             # Fallback to simple response if AI agent fails
-            return f"Agent response to: {message} (fallback due to error: {str(e)})"
+            return f"Agent response to: {message} (fallback due to error: {msg})"
+
+    async def _interact_with_agent_async(self, message: str, user_id: str, session_id: Optional[str] = None) -> str:
+        """
+        Run one agent turn and return the joined response text
+        Async callers can await this directly, skipping the sync bridge
+        """
+        types = self._types
+        content = types.Content(role="user", parts=[types.Part(text=message)])
+        # Get or create session for this user (and client session, if given)
+        session = await self._get_user_session(user_id, session_id)
+        # Write chunks as they arrive instead of holding a list of them for a final join
+        buffer = io.StringIO()
+        separator = ''
+        async for chunk in self._agent_chunks(content, session, user_id):
+            buffer.write(separator)
+            buffer.write(chunk)
+            separator = '\n'
+        return buffer.getvalue()
+
+    async def _get_user_session(self, user_id: str, session_id: Optional[str] = None):
+        """Get the cached ADK session for a user/session pair, creating it on first use"""
+        key = (user_id, session_id)
+        # Check if session already exists for this user
+        session = self.sessions.get(key)
+        if session is not None:
+            self.logger.info("Reusing existing session for user %s", user_id)
+            return session
+
+        lock = self._session_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another request may have created it while we waited
+            session = self.sessions.get(key)
+            if session is None:
+                # Create new session for this user
+                session = await self.session_service.create_session(
+                    state={},
+                    app_name="travel-concierge",
+                    user_id=user_id
+                )
+                self.sessions.set(key, session)
+                self.logger.info("Created new session for user %s", user_id)
+        if not lock.locked():
+            self._session_locks.pop(key, None)
+        return session
+
+    def _discard_session(self, session) -> None:
+        """Drop an evicted session from the ADK session service"""
+        asyncio.run_coroutine_threadsafe(
+            self.session_service.delete_session(
+                app_name="travel-concierge",
+                user_id=session.user_id,
+                session_id=session.id
+            ),
+            _get_event_loop()
+        )
+
+    async def _agent_chunks(self, content, session, user_id: str) -> AsyncIterator[str]:
+        """Yield cleaned response chunks from the runner's events as they arrive"""
+        events_async = self.runner.run_async(
+            session_id=session.id,
+            user_id=user_id,
+            new_message=content
+        )
+
+        async for event in events_async:
+            if event.content and event.content.parts:
+                for part in event.content.parts:
+                    if part.text:
+                        # Clean up the text response
+                        text = part.text.strip()
+                        if text and text != "{}":
+                            yield text
+                    # Handle function responses that might contain map_url and image_url
+                    if part.function_response:
+                        func_response = str(part.function_response.response)
+                        if func_response and func_response != "{}":
+                            yield func_response
+                    # Handle function calls
+                    if part.function_call:
+                        # Extract function call name and arguments
+                        func_name = part.function_call.name if hasattr(part.function_call, 'name') else 'unknown'
+                        func_args = part.function_call.args if hasattr(part.function_call, 'args') else {}
+                        if func_name and func_args:
+                            yield f"Calling {func_name} with arguments: {func_args}"
+
+    async def stream_chat_message(self, message: str, user_id: str, session_id: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Stream the AI Agent's reply chunk by chunk as ADK events arrive
+
+        Chunks are already enhanced for mobile app parsing; joining them with
+        newlines gives the same text as process_chat_message's response.
+        """
+        types = self._types
+        session = await self._get_user_session(user_id, session_id)
+        content = types.Content(role="user", parts=[types.Part(text=message)])
+
+        # A chunk ending in e.g. "Ngày" may get its number from the next chunk,
+        # so hold it back and enhance both together
+        pending = ''
+        async for chunk in self._agent_chunks(content, session, user_id):
+            text = f"{pending}\n{chunk}" if pending else chunk
+            if DAY_TAIL_RE.search(text):
+                pending = text
+                continue
+            pending = ''
+            yield self._enhance_response_structure(text)
+        if pending:
+            yield self._enhance_response_structure(pending)
+
+    def iter_chat_message(self, message: str, user_id: str, session_id: Optional[str] = None) -> Iterator[str]:
+        """Synchronous view of stream_chat_message, driven on the background loop"""
+        stream = self.stream_chat_message(message, user_id, session_id)
+        pending = None  # Loop-side task of the latest _next_chunk call
+
+        async def next_chunk():
+            nonlocal pending
+            pending = asyncio.current_task()
+            return await _next_chunk(stream)
+
+        try:
+            while True:
+                chunk = _run_on_event_loop(next_chunk())
+                if chunk is _STREAM_END:
+                    return
+                yield chunk
+        finally:
+            _run_on_event_loop(_close_stream(stream, pending))
 
     def get_agent_status(self) -> Dict[str, Any]:
         """Get status information about the AI Agent system"""
         try:
-            return {
-                'agent_name': self.root_agent.name if hasattr(self.root_agent, 'name') else 'root_agent',
-                'description': self.root_agent.description if hasattr(self.root_agent, 'description') else 'Travel Concierge Agent',
-                'sub_agents_count': len(self.root_agent.sub_agents) if hasattr(self.root_agent, 'sub_agents') else 0,
-                'status': 'active'
-            }
+            # Callers add extra keys to the status, so hand out a copy
+            return dict(self._status_info)
         except Exception as e:
-            self.logger.error(f"Error getting agent status: {e}")
-            return {'status': 'error', 'message': str(e)}
+            msg = str(e)
+            self.logger.error("Error getting agent status: %s", msg)
+            return {'status': 'error', 'message': msg}
 
     def get_available_sub_agents(self) -> List[Dict[str, Any]]:
         """Get information about available sub-agents"""
         try:
-            if not hasattr(self.root_agent, 'sub_agents'):
-                return []
-
-            sub_agents_info = []
-            for sub_agent in self.root_agent.sub_agents:
-                sub_agents_info.append({
-                    'name': sub_agent.name if hasattr(sub_agent, 'name') else 'unknown',
-                    'description': sub_agent.description if hasattr(sub_agent, 'description') else 'No description',
-                })
-
-            return sub_agents_info
+            # The cached summaries are read-only and shared, only the list is copied
+            return list(self._sub_agent_summaries)
 
         except Exception as e:
-            self.logger.error(f"Error getting sub-agents info: {e}")
+            self.logger.error("Error getting sub-agents info: %s", e)
             return []
 
     def validate_agent_configuration(self) -> Dict[str, Any]:
         """Validate that the agent system is properly configured"""
         try:
-            validation_results = {
-                'root_agent_available': self.root_agent is not None,
-                'has_sub_agents': hasattr(self.root_agent, 'sub_agents') and len(self.root_agent.sub_agents) > 0,
-                'configuration_valid': True,
-                'errors': []
-            }
-
-            if not validation_results['root_agent_available']:
-                validation_results['errors'].append('Root agent not available')
-                validation_results['configuration_valid'] = False
-
-            if not validation_results['has_sub_agents']:
-                validation_results['errors'].append('No sub-agents configured')
-                validation_results['configuration_valid'] = False
-
-            return validation_results
+            validation = self._configuration_validation
+            return {**validation, 'errors': list(validation['errors'])}
 
         except Exception as e:
-            self.logger.error(f"Error validating agent configuration: {e}")
+            msg = str(e)
+            self.logger.error("Error validating agent configuration: %s", msg)
             return {
                 'configuration_valid': False,
-                'errors': [str(e)]
+                'errors': [msg]
             }
 
+    def _build_configuration_validation(self) -> Dict[str, Any]:
+        """Check the root agent and its sub-agents"""
+        root_ok = self.root_agent is not None
+        has_sub_agents = self.sub_agent_count > 0
+
+        errors = []
+        if not root_ok:
+            errors.append('Root agent not available')
+        if not has_sub_agents:
+            errors.append('No sub-agents configured')
+
+        return {
+            'root_agent_available': root_ok,
+            'has_sub_agents': has_sub_agents,
+            'configuration_valid': not errors,
+            'errors': errors
+        }
+
     def _enhance_response_structure(self, response: str) -> str:
         """
         Enhance response structure to ensure consistent format for mobile app parsing
         """
-        try:
-            # Ensure Day format is consistent
-            import re
-
-            # Replace any "Ngày X" with "Day X" for mobile app compatibility
-            response = re.sub(r'Ngày\s*(\d+)', r'Day \1', response, flags=re.IGNORECASE)
-            response = re.sub(r'Ngày\s*(\d+)', r'Day \1', response, flags=re.IGNORECASE)
-
-            # Replace other language variations
-            response = re.sub(r'Jour\s*(\d+)', r'Day \1', response, flags=re.IGNORECASE)
-            response = re.sub(r'Día\s*(\d+)', r'Day \1', response, flags=re.IGNORECASE)
-            response = re.sub(r'Tag\s*(\d+)', r'Day \1', response, flags=re.IGNORECASE)
-
-            # Ensure map_url and image_url are mentioned if they exist in the response
-            if 'map_url' in response and 'image_url' in response:
-                # Response already has the required fields
-                pass
-            else:
-                # Add note about missing fields for debugging
-                self.logger.info("Response may be missing map_url or image_url fields")
+        return _enhance_response(response)
 
-            return response
 
-        except Exception as e:
-            self.logger.warning(f"Error enhancing response structure: {e}")
-            return response
\ No newline at end of file
+@lru_cache(maxsize=None)
+def get_agent_service() -> AgentService:
+    """Process-wide AgentService, so its runner and session cache outlive a single request"""
+    return AgentService()
@@ -4,9 +4,15 @@ This service handles travel-specific operations that don't directly involve AI a
 """
 
 import logging
+from functools import lru_cache
 from typing import Dict, Any, Optional, List
 from django.core.exceptions import ValidationError
 
+# Healthy tool availability results keyed by tool name. The checks are
+# imports, and a module that imported once stays imported, so a healthy result
+# is final; failures are not cached, so a transient error is checked again
+_tool_status_cache: Dict[str, Dict[str, Any]] = {}
+
 
 class TravelService:
     """Service class for travel-related business logic"""
@@ -74,9 +80,9 @@ class TravelService:
         try:
             # Check status of travel tools (places API, search, etc.)
             status = {
-                'places_api': self._check_places_api_status(),
-                'search_tools': self._check_search_tools_status(),
-                'memory_tools': self._check_memory_tools_status(),
+                'places_api': self._cached_tool_status('places_api', self._check_places_api_status),
+                'search_tools': self._cached_tool_status('search_tools', self._check_search_tools_status),
+                'memory_tools': self._cached_tool_status('memory_tools', self._check_memory_tools_status),
             }
 
             all_healthy = all(tool_status.get('healthy', False) for tool_status in status.values())
@@ -93,6 +99,16 @@ class TravelService:
                 'error': str(e)
             }
 
+    def _cached_tool_status(self, name: str, check) -> Dict[str, Any]:
+        """Return the status of tool ``name``, running its check until it passes"""
+        tool_status = _tool_status_cache.get(name)
+        if tool_status is None:
+            tool_status = check()
+            if tool_status.get('healthy'):
+                _tool_status_cache[name] = tool_status
+        # Callers get their own copy so the cached entry stays intact
+        return dict(tool_status)
+
     def _check_places_api_status(self) -> Dict[str, Any]:
         """Check Google Places API status"""
         try:
@@ -169,4 +185,10 @@ class TravelService:
                 'service': 'Memory Tools',
                 'status': 'error',
                 'error': str(e)
-            }
\ No newline at end of file
+            }
+
+
+@lru_cache(maxsize=None)
+def get_travel_service() -> TravelService:
+    """Process-wide TravelService shared by the views"""
+    return TravelService()
@@ -14,7 +14,9 @@
 
 """Prompt for the inspiration agent."""
 
-INSPIRATION_AGENT_INSTR = """
+# Static part of the inspiration agent's instruction: identical on every turn,
+# so it forms a stable prefix for the model's prompt caching
+INSPIRATION_AGENT_STATIC_INSTR = """
 You are travel inspiration agent who help users find their next big dream vacation destinations.
 Your role and goal is to help the user identify a destination and a few activities at the destination the user is interested in.
 
@@ -44,7 +46,10 @@ When presenting POI suggestions to the user, make sure to include:
 - Ratings and highlights
 - Google Maps URL (map_url) for easy navigation
 - Google Place ID (place_id) for reference
+"""
 
+# Per-turn context (user profile and time), rendered after the static part
+INSPIRATION_AGENT_CONTEXT_INSTR = """
 - Please use the context info below for any user preferences:
 Current user:
   <user_profile>
@@ -54,6 +59,8 @@ Current user:
 Current time: {_time}
 """
 
+INSPIRATION_AGENT_INSTR = INSPIRATION_AGENT_STATIC_INSTR + INSPIRATION_AGENT_CONTEXT_INSTR
+
 
 POI_AGENT_INSTR = """
 You are responsible for providing a list of point of interests, things to do recommendations based on the user's destination choice. Limit the choices to 5 results.
@@ -3,12 +3,43 @@ Tests for Travel Concierge app
 Updated to work with refactored structure
 """
 
+from django.core.exceptions import ValidationError
 from django.test import TestCase, Client
 from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+import asyncio
+import copy
+import datetime
 import json
-
-from ..service.agent_service import AgentService
-from ..service.travel_service import TravelService
+import os
+import re
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from base.response.renderer import ORJSONRenderer
+from ..service.agent_service import AgentService, _chat_tasks, get_agent_service
+from ..service import travel_service
+from ..service.travel_service import get_travel_service
+from ..service._response_format import enhance
+from ..sub_agents.inspiration import prompt as inspiration_prompt
+from ..tools import places
+from ..validation.travel_validation import (
+    ChatMessageValidation,
+    AgentInteractionValidation,
+    _exceeds_size,
+    validate_chat_payload,
+    validate_agent_status_params
+)
+from ..voice_chat.adk_live_handler import (
+    EVENT_RING_SIZE,
+    _BLANK_EVENT_DATA,
+    _EventRing,
+    adk_live_handler
+)
+
+# A state placeholder such as {user_profile}; doubled braces are literal JSON
+PROMPT_PLACEHOLDER_RE = re.compile(r'(?<!\{)\{[A-Za-z_]\w*\}(?!\})')
 
 
 class TravelConciergeServiceTest(TestCase):
@@ -16,8 +47,8 @@ class TravelConciergeServiceTest(TestCase):
 
     def setUp(self):
         """Set up test data"""
-        self.agent_service = AgentService()
-        self.travel_service = TravelService()
+        self.agent_service = get_agent_service()
+        self.travel_service = get_travel_service()
 
     def test_agent_service_initialization(self):
         """Test that AgentService initializes correctly"""
@@ -30,6 +61,12 @@ class TravelConciergeServiceTest(TestCase):
         self.assertIsInstance(status, dict)
         self.assertIn('status', status)
 
+    def test_agent_metadata_properties(self):
+        """Test cached agent metadata matches the status report"""
+        status = self.agent_service.get_agent_status()
+        self.assertEqual(status['sub_agents_count'], self.agent_service.sub_agent_count)
+        self.assertEqual(len(self.agent_service.sub_agent_names), self.agent_service.sub_agent_count)
+
     def test_sub_agents_list(self):
         """Test getting sub-agents list"""
         sub_agents = self.agent_service.get_available_sub_agents()
@@ -51,17 +88,42 @@ class TravelConciergeServiceTest(TestCase):
         self.assertIsInstance(status, dict)
         self.assertIn('overall_status', status)
 
+    def test_failed_tool_check_is_retried(self):
+        """Test only healthy tool checks are cached, so a failure is checked again"""
+        check = mock.Mock(side_effect=[
+            {'healthy': False, 'status': 'error', 'error': 'transient'},
+            {'healthy': True, 'status': 'available'},
+        ])
+        with mock.patch.dict(travel_service._tool_status_cache, clear=True):
+            self.assertFalse(self.travel_service._cached_tool_status('flaky', check)['healthy'])
+            self.assertTrue(self.travel_service._cached_tool_status('flaky', check)['healthy'])
+            self.assertTrue(self.travel_service._cached_tool_status('flaky', check)['healthy'])
+        self.assertEqual(check.call_count, 2)
+
 
 class TravelConciergeAPITest(TestCase):
     """Test Travel Concierge API endpoints"""
 
+    @classmethod
+    def setUpClass(cls):
+        """Resolve endpoint URLs once for all tests"""
+        super().setUpClass()
+        cls.URL_AGENT_STATUS = reverse('travel_concierge:agent_status')
+        cls.URL_SUB_AGENTS = reverse('travel_concierge:sub_agents')
+        cls.URL_TOOLS_STATUS = reverse('travel_concierge:tools_status')
+        cls.URL_HEALTH = reverse('travel_concierge:health_check')
+        cls.URL_CHAT = reverse('travel_concierge:chat')
+        cls.URL_CHAT_STREAM = reverse('travel_concierge:chat_stream')
+        cls.URL_CHAT_ASYNC = reverse('travel_concierge:chat_async')
+        cls.URL_RECS = reverse('travel_concierge:recommendations')
+
     def setUp(self):
         """Set up test client"""
         self.client = Client()
 
     def test_agent_status_endpoint(self):
         """Test agent status API endpoint"""
-        url = reverse('travel_concierge:agent_status')
+        url = self.URL_AGENT_STATUS
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, 200)
@@ -70,7 +132,7 @@ class TravelConciergeAPITest(TestCase):
 
     def test_sub_agents_list_endpoint(self):
         """Test sub-agents list API endpoint"""
-        url = reverse('travel_concierge:sub_agents')
+        url = self.URL_SUB_AGENTS
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, 200)
@@ -79,7 +141,7 @@ class TravelConciergeAPITest(TestCase):
 
     def test_tools_status_endpoint(self):
         """Test tools status API endpoint"""
-        url = reverse('travel_concierge:tools_status')
+        url = self.URL_TOOLS_STATUS
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, 200)
@@ -88,7 +150,7 @@ class TravelConciergeAPITest(TestCase):
 
     def test_health_check_endpoint(self):
         """Test health check API endpoint"""
-        url = reverse('travel_concierge:health_check')
+        url = self.URL_HEALTH
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, 200)
@@ -97,7 +159,7 @@ class TravelConciergeAPITest(TestCase):
 
     def test_chat_with_agent_endpoint(self):
         """Test chat with agent API endpoint"""
-        url = reverse('travel_concierge:chat')
+        url = self.URL_CHAT
         payload = {
             'message': 'I want to travel to Japan',
             'user_id': 'test_user_123'
@@ -115,7 +177,7 @@ class TravelConciergeAPITest(TestCase):
 
     def test_travel_recommendations_endpoint(self):
         """Test travel recommendations API endpoint"""
-        url = reverse('travel_concierge:recommendations')
+        url = self.URL_RECS
         payload = {
             'destination_type': 'beach',
             'budget_range': 'mid-range',
@@ -135,7 +197,7 @@ class TravelConciergeAPITest(TestCase):
 
     def test_chat_validation_error(self):
         """Test chat endpoint with invalid data"""
-        url = reverse('travel_concierge:chat')
+        url = self.URL_CHAT
         payload = {
             'message': '',  # Empty message should fail validation
             'user_id': 'test_user_123'
@@ -151,9 +213,82 @@ class TravelConciergeAPITest(TestCase):
         data = json.loads(response.content)
         self.assertFalse(data['success'])
 
+    def test_chat_stream_endpoint(self):
+        """Test streaming chat endpoint returns Server-Sent Events"""
+        url = self.URL_CHAT_STREAM
+        payload = {
+            'message': 'I want to travel to Japan',
+            'user_id': 'test_user_123'
+        }
+
+        # Stand in for the agent so the test doesn't run a real turn
+        chunks = ['Day 1: Tokyo', 'Day 2: Kyoto']
+        with mock.patch.object(AgentService, 'iter_chat_message', return_value=iter(chunks)) as iter_chat:
+            response = self.client.post(
+                url,
+                data=json.dumps(payload),
+                content_type='application/json'
+            )
+
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response['Content-Type'].startswith('text/event-stream'))
+            body = b''.join(response.streaming_content).decode('utf-8')
+
+        iter_chat.assert_called_once_with('I want to travel to Japan', 'test_user_123', None)
+        for chunk in chunks:
+            self.assertIn(json.dumps({'chunk': chunk}), body)
+        self.assertIn('event: done', body)
+
+    def test_chat_async_endpoint(self):
+        """Test queued chat endpoint returns a task id that can be polled"""
+        url = self.URL_CHAT_ASYNC
+        payload = {
+            'message': 'I want to travel to Japan',
+            'user_id': 'test_user_123'
+        }
+
+        # Stand in for the agent so the worker thread doesn't run a real turn
+        result = {
+            'success': True,
+            'response': 'Day 1: Tokyo',
+            'user_id': 'test_user_123',
+            'session_id': None
+        }
+        with mock.patch.object(AgentService, 'process_chat_message', return_value=result):
+            response = self.client.post(
+                url,
+                data=json.dumps(payload),
+                content_type='application/json'
+            )
+
+            self.assertEqual(response.status_code, 202)
+            data = json.loads(response.content)
+            self.assertTrue(data['success'])
+            task_id = data['data']['task_id']
+
+            # Let the queued task finish before the patch (and the test) ends
+            _chat_tasks.get(task_id).result(timeout=10)
+
+        result_url = reverse('travel_concierge:chat_result', args=[task_id])
+        response = self.client.get(result_url)
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(data['data']['status'], 'completed')
+        self.assertEqual(data['data']['result'], result)
+
+    def test_chat_result_unknown_task(self):
+        """Test polling an unknown chat task returns 404"""
+        url = reverse('travel_concierge:chat_result', args=['unknown'])
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 404)
+        data = json.loads(response.content)
+        self.assertFalse(data['success'])
+
     def test_recommendations_validation_error(self):
         """Test recommendations endpoint with invalid data"""
-        url = reverse('travel_concierge:recommendations')
+        url = self.URL_RECS
         payload = {
             'destination_type': 'invalid_type',  # Should fail validation
             'budget_range': 'mid-range'
@@ -167,4 +302,360 @@ class TravelConciergeAPITest(TestCase):
 
         self.assertEqual(response.status_code, 400)
         data = json.loads(response.content)
-        self.assertFalse(data['success'])
\ No newline at end of file
+        self.assertFalse(data['success'])
+
+
+class ResponseFormatTest(TestCase):
+    """Golden tests for the Day N rewrite applied to agent responses"""
+
+    def test_day_markers_rewritten(self):
+        """Test localized day markers become "Day N" in one pass"""
+        self.assertEqual(
+            enhance("Ngày 1: Hà Nội\nngày 2: Huế\nJour 3, Día 4, Tag 5"),
+            "Day 1: Hà Nội\nDay 2: Huế\nDay 3, Day 4, Day 5"
+        )
+        self.assertEqual(enhance("NGÀY 7"), "Day 7")
+
+    def test_mixed_case_day_markers_rewritten(self):
+        """Test markers in any casing are rewritten, as DAY_RE ignores case"""
+        self.assertEqual(enhance("TaG 3, ngÀy 4, jOUR 5, DíA 6"), "Day 3, Day 4, Day 5, Day 6")
+
+    def test_response_without_markers_unchanged(self):
+        """Test English responses and markers without a number are left as is"""
+        text = "Day 1: Tokyo, map_url and image_url included"
+        self.assertIs(enhance(text), text)
+        self.assertEqual(enhance("Ngày đẹp trời"), "Ngày đẹp trời")
+
+    def test_empty_response(self):
+        """Test empty and missing responses pass through unchanged"""
+        self.assertEqual(enhance(""), "")
+        self.assertIsNone(enhance(None))
+
+
+class PromptPrefixTest(TestCase):
+    """Per-turn values must stay at the end of instructions so the prefix is cacheable"""
+
+    def test_static_instructions_have_no_placeholders(self):
+        """Test static instructions don't vary from turn to turn"""
+        for instr in (
+            inspiration_prompt.INSPIRATION_AGENT_STATIC_INSTR,
+            inspiration_prompt.POI_AGENT_INSTR,
+            inspiration_prompt.PLACE_AGENT_INSTR,
+        ):
+            self.assertIsNone(PROMPT_PLACEHOLDER_RE.search(instr))
+
+    def test_inspiration_context_is_trailing(self):
+        """Test the inspiration instruction is the static prefix plus context"""
+        self.assertTrue(inspiration_prompt.INSPIRATION_AGENT_INSTR.startswith(
+            inspiration_prompt.INSPIRATION_AGENT_STATIC_INSTR
+        ))
+        self.assertEqual(
+            set(PROMPT_PLACEHOLDER_RE.findall(inspiration_prompt.INSPIRATION_AGENT_CONTEXT_INSTR)),
+            {'{user_profile}', '{_time}'}
+        )
+
+
+class ChatMessageValidationTest(TestCase):
+    """Test chat message validation rules"""
+
+    def test_valid_message(self):
+        """Test a normal message and user ID pass validation"""
+        validation = ChatMessageValidation(data={'message': 'Plan a trip to Đà Nẵng', 'user_id': 'user.name_1-2'})
+        self.assertTrue(validation.is_valid())
+
+    def test_harmful_content_rejected(self):
+        """Test script-like content is rejected regardless of case"""
+        for message in ('<SCRIPT>alert(1)</script>', 'JavaScript:void(0)', '<img OnError=x>'):
+            validation = ChatMessageValidation(data={'message': message, 'user_id': 'user1'})
+            self.assertFalse(validation.is_valid())
+            self.assertIn('message', validation.errors)
+
+    def test_invalid_user_id_rejected(self):
+        """Test user IDs with characters outside the allowed set are rejected"""
+        for user_id in ('user 1', 'user@example.com', 'người_dùng'):
+            validation = ChatMessageValidation(data={'message': 'Hello', 'user_id': user_id})
+            self.assertFalse(validation.is_valid())
+            self.assertIn('user_id', validation.errors)
+
+    def test_chat_payload(self):
+        """Test the chat payload check strips fields like the serializer does"""
+        self.assertEqual(
+            validate_chat_payload({'message': ' Hello ', 'user_id': 'user1', 'session_id': 's1'}),
+            ('Hello', 'user1', 's1')
+        )
+        self.assertEqual(validate_chat_payload({'message': 'Hello', 'user_id': 'user1'}), ('Hello', 'user1', None))
+
+    def test_chat_payload_numbers_coerced(self):
+        """Test numeric fields are accepted as text, like CharField, but booleans aren't"""
+        self.assertEqual(validate_chat_payload({'message': 42, 'user_id': 123}), ('42', '123', None))
+        self.assertEqual(validate_chat_payload({'message': 1.5, 'user_id': 'user1'})[0], '1.5')
+        with self.assertRaises(ValidationError):
+            validate_chat_payload({'message': 'Hello', 'user_id': True})
+
+    def test_chat_payload_blank_session_id(self):
+        """Test a blank session ID means the user's default session"""
+        for session_id in ('', '   '):
+            self.assertEqual(
+                validate_chat_payload({'message': 'Hello', 'user_id': 'user1', 'session_id': session_id}),
+                ('Hello', 'user1', None)
+            )
+
+    def test_chat_payload_rejected(self):
+        """Test the chat payload check rejects what ChatMessageValidation rejects"""
+        for payload in (
+            {'message': '   ', 'user_id': 'user1'},
+            {'message': 'x' * 5001, 'user_id': 'user1'},
+            {'message': '<script>alert(1)</script>', 'user_id': 'user1'},
+            {'message': 'Hello', 'user_id': 'user 1'},
+            {'message': 'Hello'},
+            ['Hello', 'user1'],
+        ):
+            with self.assertRaises(ValidationError):
+                validate_chat_payload(payload)
+
+
+class AgentInteractionValidationTest(TestCase):
+    """Test agent interaction validation rules"""
+
+    def test_small_parameters_accepted(self):
+        """Test parameters well under the size limit pass validation"""
+        validation = AgentInteractionValidation(data={
+            'interaction_type': 'planning',
+            'parameters': {'destination': 'Hội An', 'days': 3, 'tags': ['food', 'history']}
+        })
+        self.assertTrue(validation.is_valid())
+
+    def test_oversized_parameters_rejected(self):
+        """Test parameters and user context over their size limits are rejected"""
+        validation = AgentInteractionValidation(data={
+            'interaction_type': 'planning',
+            'parameters': {'notes': ['x' * 1000] * 20},
+            'user_context': {'history': 'y' * 6000}
+        })
+        self.assertFalse(validation.is_valid())
+        self.assertIn('parameters', validation.errors)
+        self.assertIn('user_context', validation.errors)
+
+    def test_size_matches_str_length_at_boundary(self):
+        """Test the size check agrees with len(str(value)) around the limit"""
+        values = [
+            {'a': 'x' * 9990},
+            {'k': '\x00' * 3000},
+            {'k': '\\' * 5000},
+            {'quote': "it's", 'nested': {'n': 1, 'f': 1.5, 'b': None}, 'items': ['é', (1,), []]},
+            {},
+        ]
+        for value in values:
+            size = len(str(value))
+            for limit in (size - 1, size, size + 1):
+                with self.subTest(size=size, limit=limit):
+                    self.assertEqual(_exceeds_size(value, limit), size > limit)
+
+    def test_parameters_at_size_limit(self):
+        """Test parameters are accepted at 10000 characters and rejected above"""
+        # "{'notes': ''}" is 13 characters and each NUL byte shows as '\x00'
+        for filler, accepted in (('\x00' * 2496 + 'x' * 3, True), ('\x00' * 2497, False)):
+            with self.subTest(accepted=accepted):
+                validation = AgentInteractionValidation(data={
+                    'interaction_type': 'planning',
+                    'parameters': {'notes': filler}
+                })
+                self.assertEqual(validation.is_valid(), accepted)
+
+
+class AgentStatusParamsTest(TestCase):
+    """Test agent status query parameter parsing"""
+
+    def test_defaults(self):
+        """Test absent flags take their defaults"""
+        self.assertEqual(validate_agent_status_params({}), {
+            'include_sub_agents': True,
+            'include_tools_status': False,
+            'detailed_info': False
+        })
+
+    def test_flags(self):
+        """Test boolean spellings are accepted and invalid ones rejected"""
+        params = validate_agent_status_params({'include_sub_agents': 'False', 'detailed_info': 'yes'})
+        self.assertFalse(params['include_sub_agents'])
+        self.assertTrue(params['detailed_info'])
+
+        with self.assertRaises(ValidationError):
+            validate_agent_status_params({'include_tools_status': 'maybe'})
+
+
+class FallbackImageTest(TestCase):
+    """Test POI fallback images come from the shipped table or the configured URL"""
+
+    def test_shipped_table(self):
+        """Test the shipped table loads and holds only hosted http(s) URLs"""
+        table_path = Path(places.__file__).with_name('fallback_images.json')
+        table = json.loads(table_path.read_text(encoding='utf-8'))
+        for destination, image_url in table.items():
+            self.assertTrue(image_url.startswith(('https://', 'http://')), destination)
+            self.assertEqual(places._fallback_image_url(destination), image_url)
+
+    def test_configured_fallback(self):
+        """Test unknown destinations use POI_FALLBACK_IMAGE_URL only when it is http(s)"""
+        cases = (
+            ('https://cdn.example.com/poi.png', 'https://cdn.example.com/poi.png'),
+            ('data:image/svg+xml,%3Csvg%3E', ''),
+            (None, ''),
+        )
+        for configured, expected in cases:
+            environ = {k: v for k, v in os.environ.items() if k != 'POI_FALLBACK_IMAGE_URL'}
+            if configured is not None:
+                environ['POI_FALLBACK_IMAGE_URL'] = configured
+            with self.subTest(configured=configured), mock.patch.dict(os.environ, environ, clear=True):
+                self.assertEqual(places._fallback_image_url('Somewhere Unlisted'), expected)
+
+    def test_no_fallback_leaves_image_unset(self):
+        """Test a POI without a photo or fallback gets no image_url rather than a placeholder"""
+        environ = {k: v for k, v in os.environ.items() if k != 'POI_FALLBACK_IMAGE_URL'}
+        with mock.patch.dict(os.environ, environ, clear=True):
+            update = places._poi_update({}, {'error': 'No places found.'}, 'Somewhere Unlisted', '')
+        self.assertNotIn('image_url', update)
+
+
+class PlacesCacheTest(TestCase):
+    """Test which Places API answers are cached"""
+
+    @staticmethod
+    def _response(payload):
+        response = mock.Mock()
+        response.content = json.dumps(payload).encode()
+        return response
+
+    def test_error_status_not_cached(self):
+        """Test quota and key errors are retried on the next lookup"""
+        service = places.PlacesService()
+        denied = self._response({'status': 'OVER_QUERY_LIMIT', 'candidates': []})
+        with mock.patch.object(places._SESSION, 'get', return_value=denied) as get:
+            self.assertIn('error', service.find_place_from_text('Hội An'))
+            self.assertIn('error', service.find_place_from_text('Hội An'))
+        self.assertEqual(get.call_count, 2)
+
+    def test_zero_results_cached(self):
+        """Test a definite 'nothing found' answer is cached"""
+        service = places.PlacesService()
+        empty = self._response({'status': 'ZERO_RESULTS', 'candidates': []})
+        with mock.patch.object(places._SESSION, 'get', return_value=empty) as get:
+            self.assertEqual(service.find_place_from_text('Nowhere'), {'error': 'No places found.'})
+            self.assertEqual(service.find_place_from_text('nowhere'), {'error': 'No places found.'})
+        self.assertEqual(get.call_count, 1)
+
+    def test_query_sent_as_written(self):
+        """Test only the cache key is normalized, not the query sent to Google"""
+        service = places.PlacesService()
+        empty = self._response({'status': 'ZERO_RESULTS', 'candidates': []})
+        with mock.patch.object(places._SESSION, 'get', return_value=empty) as get:
+            service.find_place_from_text('  Phố Cổ   Hội An ')
+            service.find_place_from_text('phố cổ hội an')
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual(get.call_args.kwargs['params']['input'], '  Phố Cổ   Hội An ')
+
+    def test_cached_photos_not_shared(self):
+        """Test callers mutating a result's photo list don't change the cached entry"""
+        service = places.PlacesService()
+        found = self._response({'status': 'OK', 'candidates': [{
+            'place_id': 'abc',
+            'name': 'Hội An',
+            'formatted_address': 'Quảng Nam, Vietnam',
+            'photos': [{'photo_reference': 'ref1'}],
+            'geometry': {'location': {'lat': 15.88, 'lng': 108.33}}
+        }]})
+        with mock.patch.object(places._SESSION, 'get', return_value=found):
+            first = service.find_place_from_text('Hội An')
+            first['photos'].clear()
+            second = service.find_place_from_text('Hội An')
+        self.assertEqual(len(second['photos']), 1)
+
+
+class ORJSONRendererTest(TestCase):
+    """The chat views' orjson renderer must produce JSONRenderer's output"""
+
+    def test_matches_json_renderer(self):
+        """Test datetimes, line separators and wide ints render as DRF does"""
+        payload = {
+            'success': True,
+            'data': {
+                'response': 'Ngày 1: Hà Nội\u2028Ngày 2: Huế\u2029',
+                'created_at': datetime.datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc),
+                'date': datetime.date(2025, 1, 2),
+                'count': 2 ** 70
+            }
+        }
+        self.assertEqual(ORJSONRenderer().render(payload), JSONRenderer().render(payload))
+
+
+class LiveSessionStreamTest(TestCase):
+    """Test the events start_live_session yields for Live API events"""
+
+    SESSION_ID = 'test_live_session'
+
+    def _stream(self, *live_events):
+        """Events yielded for ``live_events``, copied as they arrive since records are reused"""
+        async def events():
+            for event in live_events:
+                yield event
+
+        async def collect():
+            return [copy.deepcopy(record) async for record in adk_live_handler.start_live_session(self.SESSION_ID)]
+
+        adk_live_handler.active_sessions[self.SESSION_ID] = {'live_events': events()}
+        try:
+            return asyncio.run(collect())
+        finally:
+            adk_live_handler.active_sessions.pop(self.SESSION_ID, None)
+
+    def test_turn_complete(self):
+        """Test turn completion comes from the event's turn_complete field only"""
+        records = self._stream(
+            SimpleNamespace(content=None, turn_complete=None, interrupted=None),
+            SimpleNamespace(content=None, turn_complete=True, interrupted=None)
+        )
+        self.assertEqual([record['event_type'] for record in records], ['turn_complete'])
+        self.assertTrue(records[0]['data']['turn_complete'])
+
+    def test_no_stale_fields(self):
+        """Test each event carries only its own fields, not those of earlier events"""
+        no_signal = {'turn_complete': None, 'interrupted': None}
+        records = self._stream(
+            SimpleNamespace(
+                content=SimpleNamespace(parts=[SimpleNamespace(text='Xin chào', inline_data=None)]),
+                partial=False, **no_signal
+            ),
+            SimpleNamespace(
+                content=SimpleNamespace(parts=[SimpleNamespace(
+                    text=None, inline_data=SimpleNamespace(mime_type='audio/pcm;rate=24000', data=b'\x00\x01')
+                )]),
+                **no_signal
+            ),
+            SimpleNamespace(content=None, function_call=SimpleNamespace(name='map_tool'), **no_signal)
+        )
+        blank = {'session_id': self.SESSION_ID, **_BLANK_EVENT_DATA}
+        self.assertEqual([record['data'] for record in records], [
+            {**blank, 'text': 'Xin chào', 'partial': False},
+            {**blank, 'audio_data_base64': 'AAE=', 'audio_size': 2, 'mime_type': 'audio/pcm;rate=24000'},
+            {**blank, 'tool_name': 'map_tool'}
+        ])
+
+
+class EventRingTest(TestCase):
+    """Test reused live event records don't keep or leak old event data"""
+
+    def test_records_blanked_on_reuse(self):
+        """Test a record is released when the next is claimed and comes back blank after wrapping"""
+        ring = _EventRing('session')
+        first = ring.next('audio_response')
+        first['data']['audio_bytes'] = b'\x00' * 4800
+        second = ring.next('text_response')
+        self.assertIsNone(first['data']['audio_bytes'])
+
+        second['data']['text'] = 'Xin chào'
+        for _ in range(EVENT_RING_SIZE - 2):
+            ring.next('tool_call')
+        reused = ring.next('turn_complete')
+        self.assertIs(reused, first)
+        self.assertEqual(reused['data'], {'session_id': 'session', **_BLANK_EVENT_DATA})
+        self.assertIsNone(second['data']['text'])
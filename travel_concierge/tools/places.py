@@ -14,26 +14,124 @@
 
 """Wrapper to Google Maps Places API."""
 
+import copy
+import json
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Dict, List, Any
+from urllib.parse import quote_plus
 
 from google.adk.tools import ToolContext
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    # Faster parser for Places API responses, when available
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# Number of distinct place lookups kept in memory per PlacesService
+PLACES_CACHE_SIZE = 4096
+
+# Width (pixels) of the place photos linked in lookups
+PHOTO_MAXWIDTH = 400
+
+# Google Maps links for a place id, and for a free-text search (fallback)
+_MAP_URL_PREFIX = "https://www.google.com/maps/place/?q=place_id:"
+_MAP_SEARCH_URL_PREFIX = "https://www.google.com/maps/search/?api=1&query="
+
+# Pre-resolved destination images used when Places has no photo: lowercased
+# destination name -> hosted http(s) image URL, loaded once from
+# fallback_images.json. Names missing from it use POI_FALLBACK_IMAGE_URL
+_FALLBACK_IMAGES: Dict[str, str] = _json_loads(
+    Path(__file__).with_name("fallback_images.json").read_bytes()
+)
+
+# Upper bound on concurrent Places API lookups in one map_tool call
+MAP_TOOL_MAX_WORKERS = 8
+
+# Upper bound on Places API requests in flight across all map_tool calls in
+# this process, so bursts from concurrent agents don't trip the quota (429)
+PLACES_API_MAX_CONCURRENCY = 16
+_PLACES_API_SLOTS = threading.BoundedSemaphore(PLACES_API_MAX_CONCURRENCY)
+
+# (connect, read) timeouts in seconds for Places API calls
+PLACES_API_TIMEOUT = (3.05, 10)
+
+# Shared HTTP session so Places API calls reuse pooled keep-alive connections
+# instead of a new TCP+TLS handshake per lookup; transient errors are retried
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+    ),
+)
+
+
+# Places API statuses that are answers about the query itself, so safe to cache.
+# Any other status (OVER_QUERY_LIMIT, REQUEST_DENIED, ...) is about the request
+_CACHEABLE_STATUSES = frozenset(("OK", "ZERO_RESULTS"))
+
+
+class PlacesAPIError(Exception):
+    """The Places API answered with an error status instead of results."""
 
 
 class PlacesService:
     """Wrapper to Placees API."""
 
-    def _check_key(self):
-        if (
-            not hasattr(self, "places_api_key") or not self.places_api_key
-        ):  # Either it doesn't exist or is None.
-            # https://developers.google.com/maps/documentation/places/web-service/get-api-key
-            self.places_api_key = os.getenv("GOOGLE_PLACES_API_KEY")
+    def __init__(self):
+        self._resolve_key()
+        # Lookups keyed by normalized query text, least recently used first.
+        # Failed requests and error statuses raise out of _fetch_place, so
+        # only OK and ZERO_RESULTS answers are cached
+        self._place_cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._place_cache_lock = threading.Lock()
+
+    def _resolve_key(self):
+        # https://developers.google.com/maps/documentation/places/web-service/get-api-key
+        self.places_api_key = os.getenv("GOOGLE_PLACES_API_KEY")
+        # Photo URLs only differ by photo reference, so build the rest once
+        self._photo_prefix = (
+            "https://maps.googleapis.com/maps/api/place/photo"
+            f"?maxwidth={PHOTO_MAXWIDTH}&key={self.places_api_key}&photoreference="
+        )
 
     def find_place_from_text(self, query: str) -> Dict[str, str]:
         """Fetches place details using a text query."""
-        self._check_key()
+        if not self.places_api_key:
+            # The environment may have been loaded after this service was created
+            self._resolve_key()
+        # Case and spacing don't change the match, so they don't split the
+        # cache; Google still gets the query exactly as written
+        key = " ".join(query.lower().split())
+        with self._place_cache_lock:
+            place = self._place_cache.get(key)
+            if place is not None:
+                self._place_cache.move_to_end(key)
+        if place is None:
+            try:
+                place = self._fetch_place(query)
+            except (requests.exceptions.RequestException, PlacesAPIError, ValueError) as e:
+                # ValueError: a response body that isn't valid JSON
+                return {"error": f"Error fetching place data: {e}"}
+            with self._place_cache_lock:
+                self._place_cache[key] = place
+                if len(self._place_cache) > PLACES_CACHE_SIZE:
+                    self._place_cache.popitem(last=False)
+        # Deep copy so callers can't modify the cached entry or its photo list
+        return copy.deepcopy(place)
+
+    def _fetch_place(self, query: str) -> Dict[str, str]:
+        """Calls the Places API for a text query; raises on request and API errors."""
         places_url = "https://maps.googleapis.com/maps/api/place/findplacefromtext/json"
         params = {
             "input": query,
@@ -42,55 +140,102 @@ class PlacesService:
             "key": self.places_api_key,
         }
 
-        try:
-            response = requests.get(places_url, params=params)
-            response.raise_for_status()
-            place_data = response.json()
-
-            if not place_data.get("candidates"):
-                return {"error": "No places found."}
-
-            # Extract data for the first candidate
-            place_details = place_data["candidates"][0]
-            place_id = place_details["place_id"]
-            place_name = place_details["name"]
-            place_address = place_details["formatted_address"]
-            photos = self.get_photo_urls(place_details.get("photos", []), maxwidth=400)
-            map_url = self.get_map_url(place_id)
-            location = place_details["geometry"]["location"]
-            lat = str(location["lat"])
-            lng = str(location["lng"])
-
-            return {
-                "place_id": place_id,
-                "place_name": place_name,
-                "place_address": place_address,
-                "photos": photos,
-                "map_url": map_url,
-                "lat": lat,
-                "lng": lng,
-            }
-
-        except requests.exceptions.RequestException as e:
-            return {"error": f"Error fetching place data: {e}"}
-
-    def get_photo_urls(self, photos: List[Dict[str, Any]], maxwidth: int = 400) -> List[str]:
+        with _PLACES_API_SLOTS:
+            response = _SESSION.get(places_url, params=params, timeout=PLACES_API_TIMEOUT)
+        response.raise_for_status()
+        place_data = _json_loads(response.content)
+
+        # Quota, key and request errors still come back as HTTP 200
+        api_status = place_data.get("status")
+        if api_status not in _CACHEABLE_STATUSES:
+            raise PlacesAPIError(f"{api_status}: {place_data.get('error_message', 'no details')}")
+
+        if not place_data.get("candidates"):
+            return {"error": "No places found."}
+
+        # Extract data for the first candidate
+        place_details = place_data["candidates"][0]
+        place_id = place_details["place_id"]
+        place_name = place_details["name"]
+        place_address = place_details["formatted_address"]
+        photos = self.get_photo_urls(place_details.get("photos", []))
+        map_url = self.get_map_url(place_id)
+        location = place_details["geometry"]["location"]
+        lat = str(location["lat"])
+        lng = str(location["lng"])
+
+        return {
+            "place_id": place_id,
+            "place_name": place_name,
+            "place_address": place_address,
+            "photos": photos,
+            "map_url": map_url,
+            "lat": lat,
+            "lng": lng,
+        }
+
+    def get_photo_urls(self, photos: List[Dict[str, Any]], maxwidth: int = PHOTO_MAXWIDTH) -> List[str]:
         """Extracts photo URLs from the 'photos' list."""
-        photo_urls = []
-        for photo in photos:
-            photo_url = f"https://maps.googleapis.com/maps/api/place/photo?maxwidth={maxwidth}&photoreference={photo['photo_reference']}&key={self.places_api_key}"
-            photo_urls.append(photo_url)
-        return photo_urls
+        if maxwidth == PHOTO_MAXWIDTH:
+            prefix = self._photo_prefix
+        else:
+            prefix = (
+                "https://maps.googleapis.com/maps/api/place/photo"
+                f"?maxwidth={maxwidth}&key={self.places_api_key}&photoreference="
+            )
+        return [prefix + photo["photo_reference"] for photo in photos]
 
     def get_map_url(self, place_id: str) -> str:
         """Generates the Google Maps URL for a given place ID."""
-        return f"https://www.google.com/maps/place/?q=place_id:{place_id}"
+        return _MAP_URL_PREFIX + place_id
 
 
 # Google Places API
 places_service = PlacesService()
 
 
+def _fallback_image_url(destination_name: str) -> str:
+    """Image for a destination without a Places photo, or "" if none is set."""
+    image_url = _FALLBACK_IMAGES.get(destination_name.lower())
+    if image_url:
+        return image_url
+    # Clients load image_url over the network, so only an http(s) URL will do
+    image_url = os.getenv("POI_FALLBACK_IMAGE_URL", "")
+    if image_url.startswith(("https://", "http://")):
+        return image_url
+    return ""
+
+
+def _poi_update(poi: Dict[str, Any], result: Dict[str, Any], name: str, address: str) -> Dict[str, Any]:
+    """Fields to set on a POI from its Places lookup result, with fallbacks."""
+    # Fill the place holders with verified information.
+    update = {"place_id": result.get("place_id")}
+
+    # Ensure map_url is never empty - create fallback if Google Places API fails
+    map_url = result.get("map_url")
+    if not map_url:
+        # Create a basic Google Maps URL using place name and address
+        map_url = _MAP_SEARCH_URL_PREFIX + quote_plus(f"{name} {address}")
+    update["map_url"] = map_url
+
+    # Update image_url with the first photo found, if available
+    if result.get("photos"):
+        update["image_url"] = result["photos"][0]
+    # If no Google Places photo, keep the original or use a fallback when one is configured
+    elif not poi.get("image_url"):
+        # Fallback to a generic image for the destination if no specific image is available
+        destination_name = name.split(",", 1)[0].strip()
+        image_url = _fallback_image_url(destination_name)
+        if image_url:
+            update["image_url"] = image_url
+
+    if "lat" in result and "lng" in result:
+        update["lat"] = result["lat"]
+        update["long"] = result["lng"]
+
+    return update
+
+
 def map_tool(key: str, tool_context: ToolContext):
     """
     This is going to inspect the pois stored under the specified key in the state.
@@ -124,37 +269,26 @@ def map_tool(key: str, tool_context: ToolContext):
         pois = []
         pois_data["places"] = pois
 
-    for poi in pois:  # The pydantic object types.POI
-        # Ensure poi is a dictionary
-        if not isinstance(poi, dict):
-            continue
-
-        location = poi.get("place_name", "") + ", " + poi.get("address", "")
-        result = places_service.find_place_from_text(location)
-
-        # Fill the place holders with verified information.
-        poi["place_id"] = result.get("place_id")
-        poi["map_url"] = result.get("map_url")
-
-        # Ensure map_url is never empty - create fallback if Google Places API fails
-        if not poi.get("map_url") or poi["map_url"] == "":
-            # Create a basic Google Maps URL using place name and address
-            place_name = poi.get("place_name", "").replace(" ", "+")
-            address = poi.get("address", "").replace(" ", "+")
-            search_query = f"{place_name}+{address}"
-            poi["map_url"] = f"https://www.google.com/maps/search/?api=1&query={search_query}"
-
-        # Update image_url with the first photo found, if available
-        if result.get("photos"):
-            poi["image_url"] = result["photos"][0]
-        # Ensure image_url is never empty - if no Google Places photo, keep the original or use a fallback
-        elif not poi.get("image_url") or poi["image_url"] == "":
-            # Fallback to a generic image for the destination if no specific image is available
-            destination_name = poi.get("place_name", "").split(",")[0].strip()
-            poi["image_url"] = f"https://source.unsplash.com/featured/?{destination_name.replace(' ', '+')}"
-
-        if "lat" in result and "lng" in result:
-            poi["lat"] = result["lat"]
-            poi["long"] = result["lng"]
+    # The pydantic object types.POI; skip anything that isn't a dictionary
+    poi_dicts = [poi for poi in pois if isinstance(poi, dict)]
+    if not poi_dicts:
+        return {"places": pois}
+
+    # Each POI's name and address are read once, for the lookup and the fallbacks
+    names = [poi.get("place_name") or "" for poi in poi_dicts]
+    addresses = [poi.get("address") or "" for poi in poi_dicts]
+    locations = [f"{name}, {address}" for name, address in zip(names, addresses)]
+
+    # The lookups are independent HTTP calls, so run them concurrently
+    with ThreadPoolExecutor(max_workers=min(MAP_TOOL_MAX_WORKERS, len(locations))) as executor:
+        results = list(executor.map(places_service.find_place_from_text, locations))
+
+    # Work out every POI's new fields first, then apply each in one update
+    updates = [
+        _poi_update(poi, result, name, address)
+        for poi, result, name, address in zip(poi_dicts, results, names, addresses)
+    ]
+    for poi, update in zip(poi_dicts, updates):
+        poi.update(update)
 
     return {"places": pois}  # Return the updated pois
@@ -1,18 +1,36 @@
 """URLs for the travel_concierge app."""
 from django.urls import path
+from django.utils.module_loading import import_string
+from django.views.decorators.csrf import csrf_exempt
 from .view import agent_view, travel_view
-from .voice_chat.views import (
-    VoiceChatStatusView,
-    VoiceChatSessionsView,
-    VoiceChatHealthView,
-    VoiceChatConfigView
-)
 
 app_name = 'travel_concierge'
 
+
+def _voice_chat_view(name):
+    """
+    View for voice_chat.views.<name>, imported on its first request so
+    loading the URLconf doesn't start up the voice chat stack
+    (WebSocket server, ADK Live handler)
+    """
+    view = None
+
+    @csrf_exempt  # Like the voice chat views themselves
+    def lazy_view(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(f'travel_concierge.voice_chat.views.{name}').as_view()
+        return view(request, *args, **kwargs)
+
+    return lazy_view
+
+
 urlpatterns = [
     # AI Agent endpoints
     path('chat/', agent_view.chat_with_agent, name='chat'),
+    path('chat/stream/', agent_view.chat_with_agent_stream, name='chat_stream'),
+    path('chat/async/', agent_view.submit_chat_message, name='chat_async'),
+    path('chat/result/<str:task_id>/', agent_view.get_chat_result, name='chat_result'),
     path('status/', agent_view.get_agent_status, name='agent_status'),
     path('sub-agents/', agent_view.list_sub_agents, name='sub_agents'),
     path('interaction/', agent_view.agent_interaction, name='agent_interaction'),
@@ -23,8 +41,8 @@ urlpatterns = [
     path('health/', travel_view.health_check, name='health_check'),
 
     # Voice Chat endpoints
-    path('voice-chat/status/', VoiceChatStatusView.as_view(), name='voice_chat_status'),
-    path('voice-chat/sessions/', VoiceChatSessionsView.as_view(), name='voice_chat_sessions'),
-    path('voice-chat/health/', VoiceChatHealthView.as_view(), name='voice_chat_health'),
-    path('voice-chat/config/', VoiceChatConfigView.as_view(), name='voice_chat_config'),
+    path('voice-chat/status/', _voice_chat_view('VoiceChatStatusView'), name='voice_chat_status'),
+    path('voice-chat/sessions/', _voice_chat_view('VoiceChatSessionsView'), name='voice_chat_sessions'),
+    path('voice-chat/health/', _voice_chat_view('VoiceChatHealthView'), name='voice_chat_health'),
+    path('voice-chat/config/', _voice_chat_view('VoiceChatConfigView'), name='voice_chat_config'),
 ]
\ No newline at end of file
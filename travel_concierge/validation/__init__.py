@@ -4,10 +4,14 @@ from .travel_validation import (
     TravelRecommendationValidation,
     ChatMessageValidation,
     AgentStatusValidation,
+    validate_chat_payload,
+    validate_agent_status_params,
 )
 
 __all__ = [
     'TravelRecommendationValidation',
     'ChatMessageValidation',
     'AgentStatusValidation',
+    'validate_chat_payload',
+    'validate_agent_status_params',
 ]
\ No newline at end of file
@@ -3,11 +3,84 @@ Validation classes for Travel Concierge app
 These handle validation logic separate from serializers
 """
 
-import re
+import string
+from typing import Any, Dict, Optional, Tuple
 from rest_framework import serializers
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 
+# Allowed user ID characters: letters, digits, underscore, hyphen and dot.
+# Translating with this table deletes them, leaving only invalid characters
+_USER_ID_DELETE_TABLE = str.maketrans('', '', string.ascii_letters + string.digits + '_-.')
+
+# Basic content filtering - can be expanded. All literals, matched against the
+# casefolded message (casefold, unlike lower, also folds e.g. 'ſ' to 's')
+_HARMFUL_LITERALS = ('<script', 'javascript:', 'onclick=', 'onerror=')
+
+
+def _has_harmful_content(message: str) -> bool:
+    """Whether ``message`` contains any of _HARMFUL_LITERALS, ignoring case"""
+    # Every literal contains '<', ':' or '=', so most messages need no casefold
+    if '<' not in message and ':' not in message and '=' not in message:
+        return False
+    message = message.casefold()
+    return any(literal in message for literal in _HARMFUL_LITERALS)
+
+
+# Accepted values for the choice fields below. The error messages list them in
+# their original order, so the tuples are kept alongside the lookup sets
+_DESTINATION_TYPES = (
+    'beach', 'mountain', 'city', 'countryside', 'adventure',
+    'cultural', 'relaxation', 'business', 'family', 'romantic'
+)
+_VALID_DESTINATION_TYPES = frozenset(_DESTINATION_TYPES)
+_DESTINATION_TYPE_ERROR = f"Invalid destination type. Must be one of: {', '.join(_DESTINATION_TYPES)}"
+
+_BUDGET_RANGES = ('budget', 'mid-range', 'luxury', 'ultra-luxury')
+_VALID_BUDGET_RANGES = frozenset(_BUDGET_RANGES)
+_BUDGET_RANGE_ERROR = f"Invalid budget range. Must be one of: {', '.join(_BUDGET_RANGES)}"
+
+_INTERACTION_TYPES = (
+    'chat', 'recommendation', 'planning', 'booking',
+    'inspiration', 'pre_trip', 'in_trip', 'post_trip'
+)
+_VALID_INTERACTION_TYPES = frozenset(_INTERACTION_TYPES)
+_INTERACTION_TYPE_ERROR = f"Invalid interaction type. Must be one of: {', '.join(_INTERACTION_TYPES)}"
+
+_TOOL_NAMES = ('places', 'search', 'memory', 'all')
+_VALID_TOOL_NAMES = frozenset(_TOOL_NAMES)
+# Only the offending tool name is filled in when this is raised
+_TOOL_NAME_ERROR = "Invalid tool name '{}'. Must be one of: " + ', '.join(_TOOL_NAMES)
+
+
+def _exceeds_size(value, limit):
+    """
+    Whether str(value) would be longer than ``limit`` characters.
+    Walks the structure, stopping once the limit is passed, instead of
+    building the whole string just to measure it
+    """
+    size = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            # Braces, ": " after each key and ", " between items
+            size += 2 + 2 * len(item) + 2 * max(len(item) - 1, 0)
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            size += 2 + 2 * max(len(item) - 1, 0)
+            if isinstance(item, tuple) and len(item) == 1:
+                # The trailing comma of a one-element tuple
+                size += 1
+            stack.extend(item)
+        else:
+            # Containers show their items by repr, escapes and quotes included
+            size += len(repr(item))
+        if size > limit:
+            return True
+    return False
+
 
 class BaseValidation(serializers.Serializer):
     """Base validation class with common validation methods"""
@@ -44,25 +117,68 @@ class ChatMessageValidation(BaseValidation):
         """Validate user ID format"""
         if self.validate_non_empty_string(value, "User ID"):
             # Simple validation for user ID format
-            if not re.match(r'^[a-zA-Z0-9_\-\.]+$', value):
+            if value.translate(_USER_ID_DELETE_TABLE):
                 raise serializers.ValidationError("User ID contains invalid characters")
             return value
 
     def _contains_harmful_content(self, message: str) -> bool:
         """Check for potentially harmful content in messages"""
-        # Basic content filtering - can be expanded
-        harmful_patterns = [
-            r'<script',
-            r'javascript:',
-            r'onclick=',
-            r'onerror=',
-        ]
-
-        message_lower = message.lower()
-        for pattern in harmful_patterns:
-            if re.search(pattern, message_lower):
-                return True
-        return False
+        return _has_harmful_content(message)
+
+
+def validate_chat_payload(data) -> Tuple[str, str, Optional[str]]:
+    """
+    Validate a chat message payload by the same rules as ChatMessageValidation,
+    checking the three fields directly instead of through the serializer
+    machinery, since every chat request goes through it
+
+    Returns:
+        Tuple of (message, user_id, session_id), coerced to str and stripped
+        like CharField does; a blank session_id becomes None
+
+    Raises:
+        ValidationError: If a field is missing or invalid
+    """
+    if not hasattr(data, 'get'):
+        raise ValidationError("Chat payload must be a JSON object")
+
+    message = _chat_text(data.get('message'), "Message", 5000)
+    if _has_harmful_content(message):
+        raise ValidationError("Message contains inappropriate content")
+
+    user_id = _chat_text(data.get('user_id'), "User ID", 255)
+    if user_id.translate(_USER_ID_DELETE_TABLE):
+        raise ValidationError("User ID contains invalid characters")
+
+    session_id = data.get('session_id')
+    if session_id is not None:
+        session_id = _as_text(session_id, "Session ID")
+        if len(session_id) > 255:
+            raise ValidationError("Session ID must be at most 255 characters")
+        # Blank means no session, so the user's default session is used
+        session_id = session_id or None
+
+    return message, user_id, session_id
+
+
+def _chat_text(value: Any, field_name: str, max_length: int) -> str:
+    """Validate a required, non-empty text field of a chat payload"""
+    if value is None:
+        raise ValidationError(f"{field_name} is required")
+    value = _as_text(value, field_name)
+    if not value:
+        raise ValidationError(f"{field_name} cannot be empty")
+    if len(value) > max_length:
+        raise ValidationError(f"{field_name} must be at most {max_length} characters")
+    return value
+
+
+def _as_text(value: Any, field_name: str) -> str:
+    """Coerce a chat payload value to stripped text, accepting numbers like CharField"""
+    # bool is an int subclass, but CharField rejects it
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise ValidationError(f"{field_name} must be a string")
+    return str(value).strip()
 
 
 class TravelRecommendationValidation(BaseValidation):
@@ -81,26 +197,17 @@ class TravelRecommendationValidation(BaseValidation):
 
     def validate_destination_type(self, value):
         """Validate destination type"""
-        valid_types = [
-            'beach', 'mountain', 'city', 'countryside', 'adventure',
-            'cultural', 'relaxation', 'business', 'family', 'romantic'
-        ]
-
-        if value.lower() not in valid_types:
-            raise serializers.ValidationError(
-                f"Invalid destination type. Must be one of: {', '.join(valid_types)}"
-            )
-        return value.lower()
+        value = value.lower()
+        if value not in _VALID_DESTINATION_TYPES:
+            raise serializers.ValidationError(_DESTINATION_TYPE_ERROR)
+        return value
 
     def validate_budget_range(self, value):
         """Validate budget range"""
-        valid_ranges = ['budget', 'mid-range', 'luxury', 'ultra-luxury']
-
-        if value.lower() not in valid_ranges:
-            raise serializers.ValidationError(
-                f"Invalid budget range. Must be one of: {', '.join(valid_ranges)}"
-            )
-        return value.lower()
+        value = value.lower()
+        if value not in _VALID_BUDGET_RANGES:
+            raise serializers.ValidationError(_BUDGET_RANGE_ERROR)
+        return value
 
     def validate_travel_dates(self, value):
         """Validate travel dates format"""
@@ -130,6 +237,43 @@ class AgentStatusValidation(BaseValidation):
         return attrs
 
 
+# Query string spellings accepted for booleans, as by serializers.BooleanField
+_TRUE_VALUES = frozenset(('1', 't', 'true', 'y', 'yes', 'on'))
+_FALSE_VALUES = frozenset(('0', 'f', 'false', 'n', 'no', 'off'))
+
+
+def validate_agent_status_params(query_params) -> Dict[str, bool]:
+    """
+    Parse agent status query parameters by the same rules as
+    AgentStatusValidation, reading the three flags directly instead of
+    through the serializer machinery
+
+    Returns:
+        Dict with include_sub_agents, include_tools_status and detailed_info
+
+    Raises:
+        ValidationError: If a flag isn't a valid boolean
+    """
+    return {
+        'include_sub_agents': _query_bool(query_params, 'include_sub_agents', True),
+        'include_tools_status': _query_bool(query_params, 'include_tools_status', False),
+        'detailed_info': _query_bool(query_params, 'detailed_info', False),
+    }
+
+
+def _query_bool(query_params, key: str, default: bool) -> bool:
+    """Read boolean query parameter ``key``, or ``default`` if it is absent or blank"""
+    value = query_params.get(key)
+    if not value:
+        return default
+    value = value.lower()
+    if value in _TRUE_VALUES:
+        return True
+    if value in _FALSE_VALUES:
+        return False
+    raise ValidationError(f"{key} must be a valid boolean")
+
+
 class AgentInteractionValidation(BaseValidation):
     """Validation for complex agent interactions"""
 
@@ -139,16 +283,10 @@ class AgentInteractionValidation(BaseValidation):
 
     def validate_interaction_type(self, value):
         """Validate interaction type"""
-        valid_types = [
-            'chat', 'recommendation', 'planning', 'booking',
-            'inspiration', 'pre_trip', 'in_trip', 'post_trip'
-        ]
-
-        if value.lower() not in valid_types:
-            raise serializers.ValidationError(
-                f"Invalid interaction type. Must be one of: {', '.join(valid_types)}"
-            )
-        return value.lower()
+        value = value.lower()
+        if value not in _VALID_INTERACTION_TYPES:
+            raise serializers.ValidationError(_INTERACTION_TYPE_ERROR)
+        return value
 
     def validate_parameters(self, value):
         """Validate interaction parameters"""
@@ -156,7 +294,7 @@ class AgentInteractionValidation(BaseValidation):
             raise serializers.ValidationError("Parameters must be a valid JSON object")
 
         # Validate parameter size
-        if len(str(value)) > 10000:
+        if _exceeds_size(value, 10000):
             raise serializers.ValidationError("Parameters too large")
 
         return value
@@ -167,7 +305,7 @@ class AgentInteractionValidation(BaseValidation):
             raise serializers.ValidationError("User context must be a valid JSON object")
 
         # Validate context size
-        if len(str(value)) > 5000:
+        if _exceeds_size(value, 5000):
             raise serializers.ValidationError("User context too large")
 
         return value
@@ -186,12 +324,13 @@ class ToolsStatusValidation(BaseValidation):
 
     def validate_tool_names(self, value):
         """Validate tool names"""
-        valid_tools = ['places', 'search', 'memory', 'all']
-
-        for tool_name in value:
-            if tool_name.lower() not in valid_tools:
-                raise serializers.ValidationError(
-                    f"Invalid tool name '{tool_name}'. Must be one of: {', '.join(valid_tools)}"
-                )
+        tool_names = [tool_name.lower() for tool_name in value]
+        if not _VALID_TOOL_NAMES.issuperset(tool_names):
+            # Only look for the offending name once we know there is one
+            tool_name = next(
+                tool_name for tool_name, normalized in zip(value, tool_names)
+                if normalized not in _VALID_TOOL_NAMES
+            )
+            raise serializers.ValidationError(_TOOL_NAME_ERROR.format(tool_name))
 
-        return [tool.lower() for tool in value]
\ No newline at end of file
+        return tool_names
\ No newline at end of file
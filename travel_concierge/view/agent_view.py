@@ -3,21 +3,35 @@ View layer for AI Agent related endpoints
 This handles HTTP requests and delegates to service layer
 """
 
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, parser_classes, permission_classes, renderer_classes
+from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import AllowAny
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 from rest_framework import status
 from django.core.exceptions import ValidationError
+from django.http import StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
+import json
 import logging
 
-from ..service.agent_service import AgentService
+from base.parser.json_parser import ORJSONParser
+from base.response.renderer import ORJSONRenderer
+from ..service.agent_service import get_agent_service
+from ..service.travel_service import get_travel_service
 from ..validation.travel_validation import (
-    ChatMessageValidation,
-    AgentStatusValidation,
-    AgentInteractionValidation
+    AgentInteractionValidation,
+    validate_chat_payload,
+    validate_agent_status_params
 )
 
+logger = logging.getLogger(__name__)
+
+# The chat views move the largest JSON payloads (agent replies), so they encode
+# and decode JSON with orjson; other endpoints keep DRF's defaults
+CHAT_RENDERER_CLASSES = [ORJSONRenderer, BrowsableAPIRenderer]
+CHAT_PARSER_CLASSES = [ORJSONParser, FormParser, MultiPartParser]
+
 
 class AgentView:
     """View class for AI Agent API endpoints"""
@@ -25,6 +39,8 @@ class AgentView:
     @staticmethod
     @api_view(['POST'])
     @permission_classes([AllowAny])
+    @renderer_classes(CHAT_RENDERER_CLASSES)
+    @parser_classes(CHAT_PARSER_CLASSES)
     def chat_with_agent(request):
         """
         Send a chat message to the AI Agent
@@ -37,59 +53,143 @@ class AgentView:
         }
         """
         try:
-            # Log request data for debugging
-            logger = logging.getLogger(__name__)
-            logger.info(f"Received chat request: {request.data}")
-
-            # Handle potential encoding issues
-            try:
-                # Validate request data
-                validation = ChatMessageValidation(data=request.data)
-                validation.is_valid(raise_exception=True)
-            except Exception as validation_error:
-                logger.error(f"Validation error: {validation_error}")
-                logger.error(f"Request data type: {type(request.data)}")
-                logger.error(f"Request data content: {request.data}")
-                raise
-
-            # Extract validated data
-            message = validation.validated_data['message']
-            user_id = validation.validated_data['user_id']
-            session_id = validation.validated_data.get('session_id')
+            # Validate request data
+            message, user_id, session_id = validate_chat_payload(request.data)
 
-            logger.info(f"Processing message: '{message[:100]}...' for user: {user_id}")
+            logger.info("Processing message: '%.100s...' for user: %s", message, user_id)
 
             # Initialize service and process chat
-            agent_service = AgentService()
+            agent_service = get_agent_service()
             result = agent_service.process_chat_message(message, user_id, session_id)
 
-            # Ensure proper UTF-8 encoding for response
-            if 'data' in result and 'response' in result['data']:
-                response_text = result['data']['response']
-                if isinstance(response_text, bytes):
-                    result['data']['response'] = response_text.decode('utf-8', errors='replace')
-                elif not isinstance(response_text, str):
-                    result['data']['response'] = str(response_text)
-
             return Response({
                 'success': True,
                 'data': result
             }, content_type='application/json; charset=utf-8')
 
         except ValidationError as e:
-            logger.error(f"Validation error in chat_with_agent: {e}")
+            logger.error("Validation error in chat_with_agent: %s", e)
             return Response({
                 'success': False,
                 'error': str(e)
             }, status=status.HTTP_400_BAD_REQUEST)
 
         except Exception as e:
-            logger.error(f"Error in chat_with_agent: {e}")
+            logger.error("Error in chat_with_agent: %s", e)
             return Response({
                 'success': False,
                 'error': 'Unable to process chat message'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @staticmethod
+    @api_view(['POST'])
+    @permission_classes([AllowAny])
+    @renderer_classes(CHAT_RENDERER_CLASSES)
+    @parser_classes(CHAT_PARSER_CLASSES)
+    def chat_with_agent_stream(request):
+        """
+        Stream the AI Agent's reply as Server-Sent Events
+
+        Same payload as chat_with_agent. Each event carries {"chunk": "..."};
+        joining the chunks with newlines gives the full response. The stream ends
+        with a "done" event, or an "error" event if the agent fails midway.
+        """
+        try:
+            # Validate request data
+            message, user_id, session_id = validate_chat_payload(request.data)
+
+            agent_service = get_agent_service()
+            response = StreamingHttpResponse(
+                _chat_stream_events(agent_service, message, user_id, session_id),
+                content_type='text/event-stream; charset=utf-8'
+            )
+            response['Cache-Control'] = 'no-cache'
+            response['X-Accel-Buffering'] = 'no'  # Don't let proxies buffer the stream
+            return response
+
+        except ValidationError as e:
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        except Exception as e:
+            logger.error("Error in chat_with_agent_stream: %s", e)
+            return Response({
+                'success': False,
+                'error': 'Unable to process chat message'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @staticmethod
+    @api_view(['POST'])
+    @permission_classes([AllowAny])
+    @renderer_classes(CHAT_RENDERER_CLASSES)
+    @parser_classes(CHAT_PARSER_CLASSES)
+    def submit_chat_message(request):
+        """
+        Queue a chat message for the AI Agent without waiting for the reply
+
+        Same payload as chat_with_agent. Responds 202 with a task_id; poll
+        chat/result/<task_id>/ for the reply.
+        """
+        try:
+            # Validate request data
+            message, user_id, session_id = validate_chat_payload(request.data)
+
+            agent_service = get_agent_service()
+            task_id = agent_service.submit_chat_message(message, user_id, session_id)
+
+            return Response({
+                'success': True,
+                'data': {
+                    'task_id': task_id,
+                    'status': 'pending'
+                }
+            }, status=status.HTTP_202_ACCEPTED)
+
+        except ValidationError as e:
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        except Exception as e:
+            logger.error("Error in submit_chat_message: %s", e)
+            return Response({
+                'success': False,
+                'error': 'Unable to process chat message'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @staticmethod
+    @api_view(['GET'])
+    @permission_classes([AllowAny])
+    @renderer_classes(CHAT_RENDERER_CLASSES)
+    def get_chat_result(request, task_id):
+        """
+        Get the status, and once finished the result, of a queued chat message
+        """
+        try:
+            agent_service = get_agent_service()
+            result = agent_service.get_chat_result(task_id)
+
+            if result is None:
+                return Response({
+                    'success': False,
+                    'error': 'Chat task not found'
+                }, status=status.HTTP_404_NOT_FOUND)
+
+            return Response({
+                'success': True,
+                'data': result
+            }, content_type='application/json; charset=utf-8')
+
+        except Exception as e:
+            logger.error("Error in get_chat_result: %s", e)
+            return Response({
+                'success': False,
+                'error': 'Unable to get chat result'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
     @staticmethod
     @api_view(['GET'])
     @permission_classes([AllowAny])
@@ -104,25 +204,23 @@ class AgentView:
         """
         try:
             # Validate query parameters
-            validation = AgentStatusValidation(data=request.query_params)
-            validation.is_valid(raise_exception=True)
+            params = validate_agent_status_params(request.query_params)
 
             # Get agent status
-            agent_service = AgentService()
+            agent_service = get_agent_service()
             agent_status = agent_service.get_agent_status()
 
             # Include sub-agents if requested
-            if validation.validated_data.get('include_sub_agents', True):
+            if params['include_sub_agents']:
                 agent_status['sub_agents'] = agent_service.get_available_sub_agents()
 
             # Include tools status if requested
-            if validation.validated_data.get('include_tools_status', False):
-                from ..service.travel_service import TravelService
-                travel_service = TravelService()
+            if params['include_tools_status']:
+                travel_service = get_travel_service()
                 agent_status['tools_status'] = travel_service.get_travel_tools_status()
 
             # Include detailed info if requested
-            if validation.validated_data.get('detailed_info', False):
+            if params['detailed_info']:
                 agent_status['configuration'] = agent_service.validate_agent_configuration()
 
             return Response({
@@ -137,7 +235,7 @@ class AgentView:
             }, status=status.HTTP_400_BAD_REQUEST)
 
         except Exception as e:
-            logging.getLogger(__name__).error(f"Error in get_agent_status: {e}")
+            logger.error("Error in get_agent_status: %s", e)
             return Response({
                 'success': False,
                 'error': 'Unable to get agent status'
@@ -156,7 +254,7 @@ class AgentView:
         """
         try:
             # Get sub-agents
-            agent_service = AgentService()
+            agent_service = get_agent_service()
             sub_agents = agent_service.get_available_sub_agents()
 
             return Response({
@@ -165,7 +263,7 @@ class AgentView:
             })
 
         except Exception as e:
-            logging.getLogger(__name__).error(f"Error in list_sub_agents: {e}")
+            logger.error("Error in list_sub_agents: %s", e)
             return Response({
                 'success': False,
                 'error': 'Unable to list sub-agents'
@@ -174,6 +272,8 @@ class AgentView:
     @staticmethod
     @api_view(['POST'])
     @permission_classes([AllowAny])
+    @renderer_classes(CHAT_RENDERER_CLASSES)
+    @parser_classes(CHAT_PARSER_CLASSES)
     def agent_interaction(request):
         """
         Handle complex agent interactions
@@ -196,7 +296,7 @@ class AgentView:
             user_context = validation.validated_data.get('user_context', {})
 
             # Initialize service and process interaction
-            agent_service = AgentService()
+            agent_service = get_agent_service()
             result = agent_service.process_complex_interaction(
                 interaction_type, parameters, user_context
             )
@@ -213,18 +313,41 @@ class AgentView:
             }, status=status.HTTP_400_BAD_REQUEST)
 
         except Exception as e:
-            logging.getLogger(__name__).error(f"Error in agent_interaction: {e}")
+            logger.error("Error in agent_interaction: %s", e)
             return Response({
                 'success': False,
                 'error': 'Unable to process agent interaction'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def _chat_stream_events(agent_service, message, user_id, session_id):
+    """Format the agent's reply chunks as Server-Sent Events"""
+    try:
+        for chunk in agent_service.iter_chat_message(message, user_id, session_id):
+            yield f"data: {json.dumps({'chunk': chunk}, ensure_ascii=False)}\n\n"
+        yield "event: done\ndata: {}\n\n"
+    except Exception as e:
+        logger.error("Error while streaming chat response: %s", e)
+        yield f"event: error\ndata: {json.dumps({'error': 'Unable to process chat message'})}\n\n"
+
+
 # Function-based views for backward compatibility
 def chat_with_agent(request):
     return AgentView.chat_with_agent(request)
 
 
+def chat_with_agent_stream(request):
+    return AgentView.chat_with_agent_stream(request)
+
+
+def submit_chat_message(request):
+    return AgentView.submit_chat_message(request)
+
+
+def get_chat_result(request, task_id):
+    return AgentView.get_chat_result(request, task_id)
+
+
 def get_agent_status(request):
     return AgentView.get_agent_status(request)
 
@@ -10,12 +10,14 @@ from rest_framework import status
 from django.core.exceptions import ValidationError
 import logging
 
-from ..service.travel_service import TravelService
+from ..service.travel_service import get_travel_service
 from ..validation.travel_validation import (
     TravelRecommendationValidation,
     ToolsStatusValidation
 )
 
+logger = logging.getLogger(__name__)
+
 
 class TravelView:
     """View class for travel-related API endpoints"""
@@ -43,7 +45,7 @@ class TravelView:
             validation.is_valid(raise_exception=True)
 
             # Process travel recommendation
-            travel_service = TravelService()
+            travel_service = get_travel_service()
             result = travel_service.process_travel_recommendation_request(validation.validated_data)
 
             return Response({
@@ -58,7 +60,7 @@ class TravelView:
             }, status=status.HTTP_400_BAD_REQUEST)
 
         except Exception as e:
-            logging.getLogger(__name__).error(f"Error in get_travel_recommendations: {e}")
+            logger.error("Error in get_travel_recommendations: %s", e)
             return Response({
                 'success': False,
                 'error': 'Unable to process travel recommendation request'
@@ -82,7 +84,7 @@ class TravelView:
             validation.is_valid(raise_exception=True)
 
             # Get tools status
-            travel_service = TravelService()
+            travel_service = get_travel_service()
             tools_status = travel_service.get_travel_tools_status()
 
             return Response({
@@ -97,7 +99,7 @@ class TravelView:
             }, status=status.HTTP_400_BAD_REQUEST)
 
         except Exception as e:
-            logging.getLogger(__name__).error(f"Error in get_tools_status: {e}")
+            logger.error("Error in get_tools_status: %s", e)
             return Response({
                 'success': False,
                 'error': 'Unable to get tools status'
@@ -112,7 +114,7 @@ class TravelView:
         """
         try:
             # Basic health check
-            travel_service = TravelService()
+            travel_service = get_travel_service()
             tools_status = travel_service.get_travel_tools_status()
 
             overall_healthy = tools_status.get('overall_status') == 'healthy'
@@ -128,7 +130,7 @@ class TravelView:
             })
 
         except Exception as e:
-            logging.getLogger(__name__).error(f"Error in health_check: {e}")
+            logger.error("Error in health_check: %s", e)
             return Response({
                 'success': False,
                 'status': 'unhealthy',
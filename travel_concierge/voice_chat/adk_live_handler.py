@@ -11,7 +11,7 @@ import json
 import base64
 import uuid
 from typing import AsyncGenerator, Optional, Dict, Any
-from collections import deque
+from collections import OrderedDict
 
 from google.adk.agents import Agent, LiveRequestQueue
 from google.adk.runners import InMemoryRunner
@@ -43,13 +43,22 @@ def patch_telemetry_safe():
         import google.adk.core.telemetry as telemetry
 
         original_record_event = telemetry.record_event
+        # Values telemetry can serialize as they are
+        serializable_types = (str, int, float, bool, list, dict, type(None))
 
         def safe_record_event(event_name: str, **kwargs):
             try:
+                # Fast path: nothing to filter, so pass the arguments through
+                for v in kwargs.values():
+                    if not isinstance(v, serializable_types):
+                        break
+                else:
+                    return original_record_event(event_name, **kwargs)
+
                 # Filter out non-serializable data like bytes
                 safe_kwargs = {}
                 for k, v in kwargs.items():
-                    if isinstance(v, (str, int, float, bool, list, dict)) or v is None:
+                    if isinstance(v, serializable_types):
                         safe_kwargs[k] = v
                     elif isinstance(v, bytes):
                         safe_kwargs[k] = f"<bytes:{len(v)}>"
@@ -67,6 +76,77 @@ def patch_telemetry_safe():
         # Telemetry not available, skip patching
         pass
 
+# Client audio is batched per session before going to the Live API: a batch is
+# sent once it reaches AUDIO_BATCH_BYTES (200ms of 16kHz 16-bit mono PCM) or
+# AUDIO_BATCH_DELAY seconds after the previous one, whichever comes first
+AUDIO_BATCH_BYTES = 6400
+AUDIO_BATCH_DELAY = 0.04
+
+# Client audio arrives in real time at AUDIO_BYTES_PER_SECOND. Audio more than
+# AUDIO_MAX_BACKLOG_BYTES (1s) ahead of that rate, e.g. a burst after a stall,
+# is dropped instead of queued, so the conversation doesn't fall behind
+AUDIO_BYTES_PER_SECOND = 32000
+AUDIO_MAX_BACKLOG_BYTES = 32000
+
+# Sent as the user's first turn to start each conversation. Built once, since
+# every session sends the same content
+_GREETING_CONTENT = types.Content(
+    parts=[types.Part(text="Chào bạn! Tôi là trợ lý du lịch AI. Hãy nói để tôi giúp bạn lên kế hoạch chuyến đi mơ ước!")],
+    role="user"
+)
+
+# Reusable event records per live stream; a power of two so the ring index is a mask
+EVENT_RING_SIZE = 256
+
+# Per-event data fields of a record, all unset. Each event type sets only its own
+_BLANK_EVENT_DATA = {
+    'text': None,
+    'audio_data_base64': None,
+    'audio_bytes': None,
+    'audio_size': None,
+    'mime_type': None,
+    'tool_name': None,
+    'partial': None,
+    'turn_complete': None,
+    'interrupted': None
+}
+
+
+class _EventRing:
+    """
+    Fixed ring of reusable event records for one live stream, so streaming
+    doesn't allocate fresh nested dicts for every Live API event. Claiming a
+    record blanks the previously claimed one, which releases its text or
+    audio, so consumers must copy out what they need before the next event.
+    Every claimed record starts blank: only its own event type's data fields
+    are set, the others are None
+    """
+
+    __slots__ = ('_records', '_index')
+
+    def __init__(self, session_id: str):
+        self._records = [
+            {
+                'event_type': '',
+                'data': {'session_id': session_id, **_BLANK_EVENT_DATA},
+                'timestamp': 0.0
+            }
+            for _ in range(EVENT_RING_SIZE)
+        ]
+        self._index = 0
+
+    def next(self, event_type: str) -> Dict[str, Any]:
+        """Claim the next record, stamped with ``event_type`` and the current time"""
+        # Records start blank and are blanked once their successor is claimed,
+        # so at most one record in the ring holds event data at a time
+        self._records[(self._index - 1) & (EVENT_RING_SIZE - 1)]['data'].update(_BLANK_EVENT_DATA)
+        record = self._records[self._index & (EVENT_RING_SIZE - 1)]
+        self._index += 1
+        record['event_type'] = event_type
+        record['timestamp'] = time.time()
+        return record
+
+
 class ADKLiveHandler:
     """
     Simplified ADK Live Handler for automatic voice chat sessions
@@ -90,7 +170,8 @@ class ADKLiveHandler:
         self.output_sample_rate = 24000  # 24kHz output (ADK Live API)
 
         # Session management
-        self.active_sessions: Dict[str, Dict[str, Any]] = {}
+        # Kept in creation order, so the oldest session is always first
+        self.active_sessions: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
         self.user_sessions: Dict[str, str] = {}  # user_id -> session_id mapping
         self.max_sessions = 10  # Limit maximum concurrent sessions
 
@@ -163,15 +244,23 @@ class ADKLiveHandler:
                 'live_events': live_events,
                 'created_at': time.time(),
                 'is_active': True,
-                'conversation_started': True
+                'conversation_started': True,
+                'pending_audio': bytearray(),
+                'pending_deadline': 0.0,
+                'audio_flush_handle': None,
+                'inflight_bytes': 0.0,
+                'inflight_updated': time.monotonic()
             }
 
             self.active_sessions[session_id] = session_info
             self.user_sessions[user_id] = session_id
 
             # Send initial greeting to start conversation
-            initial_greeting = "Chào bạn! Tôi là trợ lý du lịch AI. Hãy nói để tôi giúp bạn lên kế hoạch chuyến đi mơ ước!"
-            await self._send_text_to_session(session_id, initial_greeting)
+            try:
+                self._send_user_content(session_info, _GREETING_CONTENT)
+                self.logger.info(f"🎬 Sent initial greeting for session {session_id}")
+            except Exception as e:
+                self.logger.error(f"❌ Failed to send initial text: {str(e)}")
 
             self.logger.info(f"✅ Created auto voice session {session_id} for user {user_id}")
             return session_info
@@ -182,29 +271,12 @@ class ADKLiveHandler:
             self.logger.error(f"❌ Exception details: {traceback.format_exc()}")
             return None
 
-    async def _send_text_to_session(self, session_id: str, text: str):
-        """Send text message to ADK session to start conversation"""
-        try:
-            session_info = self.active_sessions.get(session_id)
-            if not session_info:
-                return False
+    def _send_user_content(self, session_info: Dict[str, Any], content: types.Content):
+        """Send user content to a session's live queue, after any audio spoken before it"""
+        self._flush_audio(session_info)
 
-            live_request_queue = session_info['live_request_queue']
-
-            # Create text content
-            text_content = types.Content(
-                parts=[types.Part(text=text)],
-                role="user"
-            )
-
-            # Send to live queue (send_content is not async)
-            live_request_queue.send_content(text_content)
-            self.logger.info(f"🎬 Sent initial greeting for session {session_id}")
-            return True
-
-        except Exception as e:
-            self.logger.error(f"❌ Failed to send initial text: {str(e)}")
-            return False
+        # Send to live queue (send_content is not async)
+        session_info['live_request_queue'].send_content(content)
 
     async def process_audio_input(self, session_id: str, audio_data: bytes) -> bool:
         """Process audio input from client"""
@@ -232,14 +304,30 @@ class ADKLiveHandler:
                 self.logger.error(f"❌ No live_request_queue for session {session_id}")
                 return False
 
-            # Create audio blob
-            audio_blob = types.Blob(
-                mime_type="audio/pcm;rate=16000",
-                data=audio_data
+            # Audio not yet consumed at real-time rate, drained since the last frame
+            now = time.monotonic()
+            inflight_bytes = max(
+                0.0,
+                session_info['inflight_bytes'] - (now - session_info['inflight_updated']) * AUDIO_BYTES_PER_SECOND
             )
-
-            # Send audio to live queue using realtime method (ADK requirement for audio)
-            live_request_queue.send_realtime(audio_blob)
+            session_info['inflight_updated'] = now
+            if inflight_bytes > AUDIO_MAX_BACKLOG_BYTES:
+                session_info['inflight_bytes'] = inflight_bytes
+                self.logger.debug(f"🗑️ Dropped {len(audio_data)} bytes audio for session {session_id} to bound latency")
+                return True
+            session_info['inflight_bytes'] = inflight_bytes + len(audio_data)
+
+            # Batch audio, sending it once enough is pending or the deadline passed
+            pending_audio = session_info['pending_audio']
+            pending_audio += audio_data
+            if len(pending_audio) >= AUDIO_BATCH_BYTES or now >= session_info['pending_deadline']:
+                self._flush_audio(session_info)
+            elif session_info['audio_flush_handle'] is None:
+                # Bound the latency of audio held back when no more frames arrive
+                delay = max(0.0, session_info['pending_deadline'] - now)
+                session_info['audio_flush_handle'] = asyncio.get_running_loop().call_later(
+                    delay, self._flush_audio, session_info
+                )
 
             self.logger.debug(f"📥 Processed {len(audio_data)} bytes audio for session {session_id}")
             return True
@@ -250,8 +338,42 @@ class ADKLiveHandler:
             self.logger.error(f"❌ Exception details: {traceback.format_exc()}")
             return False
 
-    async def start_live_session(self, session_id: str) -> AsyncGenerator[Dict[str, Any], None]:
-        """Start live session streaming for responses"""
+    def _flush_audio(self, session_info: Dict[str, Any]):
+        """Send a session's pending audio to its live queue as one blob"""
+        handle = session_info['audio_flush_handle']
+        if handle is not None:
+            handle.cancel()
+            session_info['audio_flush_handle'] = None
+
+        pending_audio = session_info['pending_audio']
+        if not pending_audio or not session_info['is_active']:
+            return
+
+        try:
+            # Create audio blob
+            audio_blob = types.Blob(
+                mime_type="audio/pcm;rate=16000",
+                data=bytes(pending_audio)
+            )
+
+            # Send audio to live queue using realtime method (ADK requirement for audio)
+            session_info['live_request_queue'].send_realtime(audio_blob)
+        except Exception as e:
+            self.logger.error(f"❌ Failed to send audio for session {session_info['session_id']}: {str(e)}")
+        finally:
+            pending_audio.clear()
+            session_info['pending_deadline'] = time.monotonic() + AUDIO_BATCH_DELAY
+
+    async def start_live_session(self, session_id: str, binary_audio_output: bool = False) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Start live session streaming for responses
+
+        With binary_audio_output, model audio is yielded as raw PCM
+        ('audio_response_binary') instead of base64 ('audio_response')
+
+        Yielded events are reused records (see _EventRing), blanked once the
+        next event is yielded: copy out the fields you need before then
+        """
         session_info = self.active_sessions.get(session_id)
         if not session_info:
             self.logger.error(f"❌ Session {session_id} not found for streaming")
@@ -261,89 +383,67 @@ class ADKLiveHandler:
 
         try:
             live_events = session_info['live_events']
+            events = _EventRing(session_id)
 
             async for event in live_events:
                 try:
+                    # Read each attribute once; getattr with a default is
+                    # cheaper than a hasattr probe followed by the access
+                    content = getattr(event, 'content', None)
+                    function_call = getattr(event, 'function_call', None)
+
                     # Handle turn complete/interrupted events
-                    if hasattr(event, 'turn_complete') and event.turn_complete:
-                        yield {
-                            'event_type': 'turn_complete',
-                            'data': {
-                                'session_id': session_id,
-                                'turn_complete': True
-                            },
-                            'timestamp': time.time()
-                        }
+                    if getattr(event, 'turn_complete', None):
+                        record = events.next('turn_complete')
+                        record['data']['turn_complete'] = True
+                        yield record
                         continue
 
-                    if hasattr(event, 'interrupted') and event.interrupted:
-                        yield {
-                            'event_type': 'interrupted',
-                            'data': {
-                                'session_id': session_id,
-                                'interrupted': True
-                            },
-                            'timestamp': time.time()
-                        }
+                    if getattr(event, 'interrupted', None):
+                        record = events.next('interrupted')
+                        record['data']['interrupted'] = True
+                        yield record
                         continue
 
                     # Process content and parts (ADK structure)
-                    if hasattr(event, 'content') and event.content:
-                        content = event.content
-                        if hasattr(content, 'parts') and content.parts:
-                            for part in content.parts:
-                                # Handle text responses
-                                if hasattr(part, 'text') and part.text:
-                                    yield {
-                                        'event_type': 'text_response',
-                                        'data': {
-                                            'text': part.text,
-                                            'session_id': session_id,
-                                            'partial': getattr(event, 'partial', False)
-                                        },
-                                        'timestamp': time.time()
-                                    }
-
-                                # Handle audio responses (inline_data)
-                                elif hasattr(part, 'inline_data') and part.inline_data:
-                                    inline_data = part.inline_data
-                                    if (hasattr(inline_data, 'mime_type') and
-                                        inline_data.mime_type.startswith('audio/pcm') and
-                                        hasattr(inline_data, 'data') and inline_data.data):
-
-                                        # Convert audio data to base64 for transmission
-                                        audio_base64 = base64.b64encode(inline_data.data).decode('utf-8')
-                                        yield {
-                                            'event_type': 'audio_response',
-                                            'data': {
-                                                'audio_data_base64': audio_base64,
-                                                'audio_size': len(inline_data.data),
-                                                'session_id': session_id,
-                                                'mime_type': inline_data.mime_type
-                                            },
-                                            'timestamp': time.time()
-                                        }
+                    if content:
+                        for part in getattr(content, 'parts', None) or ():
+                            # Handle text responses
+                            text = getattr(part, 'text', None)
+                            if text:
+                                record = events.next('text_response')
+                                data = record['data']
+                                data['text'] = text
+                                data['partial'] = getattr(event, 'partial', False)
+                                yield record
+                                continue
+
+                            # Handle audio responses (inline_data)
+                            inline_data = getattr(part, 'inline_data', None)
+                            if not inline_data:
+                                continue
+                            mime_type = getattr(inline_data, 'mime_type', None)
+                            audio = getattr(inline_data, 'data', None)
+                            if mime_type and mime_type.startswith('audio/pcm') and audio:
+                                if binary_audio_output:
+                                    # Raw PCM, sent as is in a binary frame
+                                    record = events.next('audio_response_binary')
+                                    data = record['data']
+                                    data['audio_bytes'] = audio
+                                else:
+                                    # Convert audio data to base64 for transmission
+                                    record = events.next('audio_response')
+                                    data = record['data']
+                                    data['audio_data_base64'] = base64.b64encode(audio).decode('utf-8')
+                                data['audio_size'] = len(audio)
+                                data['mime_type'] = mime_type
+                                yield record
 
                     # Handle function calls
-                    elif hasattr(event, 'function_call') and event.function_call:
-                        yield {
-                            'event_type': 'tool_call',
-                            'data': {
-                                'tool_name': getattr(event.function_call, 'name', 'unknown'),
-                                'session_id': session_id
-                            },
-                            'timestamp': time.time()
-                        }
-
-                    # Handle completion events
-                    elif 'turn_complete' in str(event).lower() or 'complete' in event_type.lower():
-                        yield {
-                            'event_type': 'turn_complete',
-                            'data': {
-                                'session_id': session_id
-                            },
-                            'timestamp': time.time()
-                        }
+                    elif function_call:
+                        record = events.next('tool_call')
+                        record['data']['tool_name'] = getattr(function_call, 'name', 'unknown')
+                        yield record
 
                 except Exception as e:
                     self.logger.error(f"❌ Error processing live event: {str(e)}")
@@ -366,8 +466,11 @@ class ADKLiveHandler:
 
             self.logger.info(f"🛑 Closing voice session {session_id}")
 
-            # Mark as inactive
+            # Mark as inactive, dropping any audio still waiting to be batched
             session_info['is_active'] = False
+            handle = session_info.get('audio_flush_handle')
+            if handle is not None:
+                handle.cancel()
 
             # Close live request queue
             live_request_queue = session_info.get('live_request_queue')
@@ -430,23 +533,19 @@ class ADKLiveHandler:
     async def _cleanup_old_sessions(self):
         """Cleanup old sessions if too many are active"""
         try:
-            if len(self.active_sessions) <= self.max_sessions:
+            if len(self.active_sessions) < self.max_sessions:
                 return
-                
+
             self.logger.warning(f"⚠️ Too many sessions ({len(self.active_sessions)}), cleaning up oldest")
-            
-            # Get oldest sessions (sort by created_at)
-            session_items = list(self.active_sessions.items())
-            session_items.sort(key=lambda x: x[1].get('created_at', 0))
-            
-            # Close oldest sessions to keep only max_sessions
-            sessions_to_close = len(self.active_sessions) - self.max_sessions + 1
-            for i in range(sessions_to_close):
-                if i < len(session_items):
-                    session_id = session_items[i][0]
-                    await self.close_session(session_id)
-                    self.logger.info(f"🧹 Closed old session: {session_id}")
-                    
+
+            # Close oldest sessions to leave room for a new one
+            while len(self.active_sessions) >= self.max_sessions:
+                session_id = next(iter(self.active_sessions))
+                if not await self.close_session(session_id):
+                    # Make sure a session that failed to close can't stall the loop
+                    self.active_sessions.pop(session_id, None)
+                self.logger.info(f"🧹 Closed old session: {session_id}")
+
         except Exception as e:
             self.logger.error(f"❌ Error during old session cleanup: {str(e)}")
 
@@ -459,16 +558,12 @@ class ADKLiveHandler:
                 self.logger.error(f"❌ No active session found: {session_id}")
                 return False
 
-            live_request_queue = session_info['live_request_queue']
-
             # Create text content
             text_content = types.Content(
                 parts=[types.Part(text=text)],
                 role="user"
             )
-
-            # Send to live queue (send_content is not async)
-            live_request_queue.send_content(text_content)
+            self._send_user_content(session_info, text_content)
             self.logger.info(f"📝 Sent text input to session {session_id}: {text}")
             return True
 
@@ -16,6 +16,11 @@ from websockets.exceptions import ConnectionClosed
 
 from .adk_live_handler import adk_live_handler
 
+# Clients that offer this subprotocol get model audio as raw PCM in binary
+# frames; everyone else keeps the base64 JSON 'adk_audio_response' messages
+BINARY_AUDIO_SUBPROTOCOL = "voice-chat.binary-audio"
+SUBPROTOCOLS = [BINARY_AUDIO_SUBPROTOCOL, "voice-chat"]
+
 
 class VoiceWebSocketServer:
     """
@@ -44,17 +49,21 @@ class VoiceWebSocketServer:
         # Server state
         self.server = None
         self.is_running = False
+        self._stopped: Optional[asyncio.Event] = None  # see wait_stopped()
 
         self.logger.info(f"Voice WebSocket Server initialized on {self.host}:{self.port}")
 
     async def start_server(self):
         """Start the WebSocket server"""
+        # A new event for each start, bound to the loop now running the server,
+        # so a restart (even under a new asyncio.run) doesn't look stopped already
+        self._stopped = asyncio.Event()
         try:
             self.server = await websockets.serve(
                 self.handle_client_direct,
                 self.host,
                 self.port,
-                subprotocols=["voice-chat"]
+                subprotocols=SUBPROTOCOLS
             )
             self.is_running = True
             self.logger.info(f"🎤 Voice WebSocket Server started on ws://{self.host}:{self.port}")
@@ -70,7 +79,7 @@ class VoiceWebSocketServer:
                         self.handle_client_direct,
                         self.host,
                         self.port,
-                        subprotocols=["voice-chat"]
+                        subprotocols=SUBPROTOCOLS
                     )
                     self.is_running = True
                     self.logger.info(f"🎤 Voice WebSocket Server started on ws://{self.host}:{self.port}")
@@ -93,11 +102,18 @@ class VoiceWebSocketServer:
             await self.server.wait_closed()
             self.is_running = False
             self.logger.info("Voice WebSocket Server stopped")
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def wait_stopped(self):
+        """Wait until stop_server() is called on the server started by start_server()"""
+        await self._stopped.wait()
 
     async def handle_client(self, websocket: WebSocketServerProtocol):
         """Handle individual client connections with automatic session management"""
         client_id = f"client_{int(time.time())}_{id(websocket)}"
         session_id = None
+        binary_audio_output = websocket.subprotocol == BINARY_AUDIO_SUBPROTOCOL
 
         try:
             self.logger.info(f"🔌 New WebSocket connection: {client_id}")
@@ -112,7 +128,8 @@ class VoiceWebSocketServer:
                     'input_sample_rate': adk_live_handler.input_sample_rate,
                     'output_sample_rate': adk_live_handler.output_sample_rate,
                     'voice_name': adk_live_handler.voice_name,
-                    'supported_formats': ['audio/pcm;rate=16000']
+                    'supported_formats': ['audio/pcm;rate=16000'],
+                    'binary_audio_output': binary_audio_output
                 }
             })
 
@@ -134,7 +151,7 @@ class VoiceWebSocketServer:
                 self.logger.info(f"✅ Sent session_id to client: {session_id}")
 
                 # Start live streaming task automatically
-                asyncio.create_task(self.stream_responses(websocket, session_id))
+                asyncio.create_task(self.stream_responses(websocket, session_id, binary_audio_output))
 
                 self.logger.info(f"🎯 Auto-started voice session {session_id} for {client_id}")
             else:
@@ -277,10 +294,10 @@ class VoiceWebSocketServer:
             self.logger.error(f"❌ Error processing binary audio data: {str(e)}")
             await self.send_error(websocket, f"Binary audio processing error: {str(e)}")
 
-    async def stream_responses(self, websocket: WebSocketServerProtocol, session_id: str):
+    async def stream_responses(self, websocket: WebSocketServerProtocol, session_id: str, binary_audio_output: bool = False):
         """Stream responses from ADK back to client"""
         try:
-            async for response in adk_live_handler.start_live_session(session_id):
+            async for response in adk_live_handler.start_live_session(session_id, binary_audio_output):
                 try:
                     if response['event_type'] == 'audio_response':
                         # Send audio response in structured format for Flutter
@@ -293,6 +310,11 @@ class VoiceWebSocketServer:
                         })
                         self.logger.debug(f"📤 Sent {response['data']['audio_size']} bytes audio to client")
 
+                    elif response['event_type'] == 'audio_response_binary':
+                        # Send raw PCM audio as a binary frame
+                        await self.send_binary(websocket, response['data']['audio_bytes'])
+                        self.logger.debug(f"📤 Sent {response['data']['audio_size']} bytes binary audio to client")
+
                     elif response['event_type'] == 'text_response':
                         # Send text response
                         await self.send_message(websocket, {
@@ -344,6 +366,15 @@ class VoiceWebSocketServer:
         except Exception as e:
             self.logger.error(f"Failed to send message: {str(e)}")
 
+    async def send_binary(self, websocket: WebSocketServerProtocol, data: bytes):
+        """Send binary frame to client"""
+        try:
+            await websocket.send(data)
+        except ConnectionClosed:
+            pass  # Client disconnected
+        except Exception as e:
+            self.logger.error(f"Failed to send binary frame: {str(e)}")
+
     async def send_error(self, websocket: WebSocketServerProtocol, error_message: str):
         """Send error message to client"""
         await self.send_message(websocket, {